@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS extraction_cache (
+  rollup TEXT NOT NULL,
+  task TEXT NOT NULL,
+  payload JSONB NOT NULL,
+  created_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (rollup, task)
+);
@@ -0,0 +1,4 @@
+-- Partial HNSW index for chunk retrieval; similarity searches only ever look at chunk embeddings.
+CREATE INDEX IF NOT EXISTS embeddings_chunk_hnsw_idx ON embeddings
+  USING hnsw (embedding vector_cosine_ops)
+  WHERE object_type = 'chunk';
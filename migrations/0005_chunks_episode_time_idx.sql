@@ -0,0 +1,2 @@
+-- Serves "earliest chunks of an episode" (report key segments) straight from the index.
+CREATE INDEX IF NOT EXISTS ix_chunks_episode_tstart ON chunks (episode_id, t_start_sec NULLS FIRST, id);
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import datetime as dt
+import itertools
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from sqlalchemy import Row
+
 try:
     import yaml
 except Exception:  # pragma: no cover - fallback if PyYAML is not available
@@ -12,99 +17,112 @@ except Exception:  # pragma: no cover - fallback if PyYAML is not available
 
 from .models import Assertion, Entity, Segment, TechCard
 from .storage import (
-    fetch_assertions_for_entity,
+    fetch_assertions_for_entities,
+    fetch_cards,
     fetch_entities,
     fetch_segments_by_ids,
-    similarity_search_chunks,
 )
-from .embeddings import embed_query
 from .config import get_settings
+from .embeddings import cached_similarity_search, prepare_query_vectors
 from .utils import seconds_to_hms, slugify, take_quote
 
+_YAML_KEY_RE = re.compile(r"^[A-Za-z0-9_-]+:")
+_CHANGE_LOG_HEADER = re.compile(r"(?mi)^[ \t]*## change log[ \t\r]*$")
+_CHANGE_LOG_ENTRY = re.compile(r"(?m)^[ \t]*(-.*?)[ \t\r]*$")
+
+
+@dataclass
+class _ParsedMarkdown:
+    preamble: str
+    sections: list[tuple[str, str]]
+    change_log: list[str]
+
 
 def render_tech_card_markdown(
-    card: TechCard,
+    card: TechCard | Row,
     entity: Entity | None,
     assertions: list[Assertion],
     segments: list[Segment],
     existing_markdown: str | None = None,
+    related: list[str] | None = None,
+) -> str:
+    existing = _parse_markdown(existing_markdown) if existing_markdown else None
+    return _render_card(card, entity, assertions, segments, existing, related)
+
+
+def _render_card(
+    card: TechCard | Row,
+    entity: Entity | None,
+    assertions: list[Assertion],
+    segments: list[Segment],
+    existing: _ParsedMarkdown | None,
+    related: list[str] | None,
 ) -> str:
     frontmatter = _build_frontmatter(card, entity, assertions, segments)
     evidence_map = _build_evidence_index(assertions, segments)
     key_points = _format_key_points(card, evidence_map)
     comparisons = card.comparisons or []
     open_questions = _derive_open_questions(assertions)
-    change_log = _merge_change_log(existing_markdown, _build_change_entry(assertions))
-
-    body_lines = [
-        "---",
-        _dump_yaml(frontmatter).strip(),
-        "---",
-        "",
-        "## Summary",
-        card.short_definition.strip() or "(No summary yet)",
-        "",
-        "## Key Points",
-    ]
-    if key_points:
-        body_lines.extend([f"- {line}" for line in key_points])
-    else:
-        body_lines.append("- (No key points yet)")
-
-    body_lines.append("")
-    body_lines.append("## Comparisons")
-    if comparisons:
-        body_lines.extend([f"- {item}" for item in comparisons])
-    else:
-        body_lines.append("- (No comparisons yet)")
-
-    body_lines.append("")
-    body_lines.append("## Recent Summary")
-    body_lines.append(card.recent_summary.strip() or "(No recent summary yet)")
-
-    body_lines.append("")
-    body_lines.append("## Evidence Index")
-    if evidence_map:
-        for entry in evidence_map.values():
-            body_lines.append(f"- {entry['label']}")
-            body_lines.append(f"  - Quote: \"{entry['quote']}\"")
-    else:
-        body_lines.append("- (No evidence yet)")
-
-    body_lines.append("")
-    body_lines.append("## Related Chunks")
-    related = _related_chunks(card)
-    if related:
-        for entry in related:
-            body_lines.append(f"- {entry}")
-    else:
-        body_lines.append("- (No related chunks found)")
-
-    body_lines.append("")
-    body_lines.append("## Open Questions")
-    if open_questions:
-        body_lines.extend([f"- {item}" for item in open_questions])
-    else:
-        body_lines.append("- (None)")
-
-    body_lines.append("")
-    body_lines.append("## Change Log")
-    body_lines.extend(change_log)
-
-    return "\n".join(body_lines).strip() + "\n"
+    change_log = _merge_change_log(existing, _build_change_entry(assertions))
+
+    if related is None:
+        related = _related_chunks(card)
+
+    key_points_block = _bullets(key_points, "(No key points yet)")
+    comparisons_block = _bullets(comparisons, "(No comparisons yet)")
+    evidence_block = "\n".join(
+        f"- {entry['label']}\n  - Quote: \"{entry['quote']}\"" for entry in evidence_map.values()
+    ) or "- (No evidence yet)"
+    related_block = _bullets(related, "(No related chunks found)")
+    open_questions_block = _bullets(open_questions, "(None)")
+    change_log_block = "\n".join(change_log)
+
+    markdown = f"""---
+{_dump_yaml(frontmatter).strip()}
+---
+
+## Summary
+{card.short_definition.strip() or "(No summary yet)"}
+
+## Key Points
+{key_points_block}
+
+## Comparisons
+{comparisons_block}
+
+## Recent Summary
+{card.recent_summary.strip() or "(No recent summary yet)"}
+
+## Evidence Index
+{evidence_block}
+
+## Related Chunks
+{related_block}
+
+## Open Questions
+{open_questions_block}
+
+## Change Log
+{change_log_block}"""
+    return markdown.strip() + "\n"
+
+
+def _bullets(items: list[str], placeholder: str) -> str:
+    return "\n".join(f"- {item}" for item in items) or f"- {placeholder}"
 
 
 def write_card_markdown(
-    card: TechCard,
+    card: TechCard | Row,
     entity: Entity | None,
     assertions: list[Assertion],
     segments: list[Segment],
     out_dir: str,
+    related: list[str] | None = None,
 ) -> str:
-    slug = slugify(entity.canonical_name if entity else str(card.entity_id))
-    path = Path(out_dir) / f"{slug}.md"
-    existing = path.read_text(encoding="utf-8") if path.exists() else None
-    rendered = render_tech_card_markdown(card, entity, assertions, segments, existing)
+    path = _card_path(card, entity, out_dir)
+    existing_markdown = path.read_text(encoding="utf-8") if path.exists() else None
+    existing = _parse_markdown(existing_markdown) if existing_markdown else None
+    rendered = _render_card(card, entity, assertions, segments, existing, related)
     if existing:
         rendered = _merge_markdown(existing, rendered)
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -113,8 +131,6 @@ def write_card_markdown(
 
 
 def export_cards(out_dir: str, entity_id: int | None = None) -> list[str]:
-    from .storage import fetch_cards
-
     entities = fetch_entities()
     entity_map = {entity.id: entity for entity in entities if entity.id is not None}
     cards = fetch_cards()
@@ -122,22 +138,50 @@ def export_cards(out_dir: str, entity_id: int | None = None) -> list[str]:
     if entity_id is not None:
         entity_map = {entity_id: entity_map.get(entity_id)}
         card_map = {entity_id: card_map.get(entity_id)}
-    paths: list[str] = []
-    for eid, entity in entity_map.items():
-        if eid is None:
-            continue
-        card = card_map.get(eid)
-        if not card:
-            continue
-        assertions = fetch_assertions_for_entity(eid)
-        segment_ids = sorted({sid for assertion in assertions for sid in assertion.segment_ids})
-        segments = fetch_segments_by_ids(segment_ids)
-        paths.append(write_card_markdown(card, entity, assertions, segments, out_dir))
+    targets = [
+        (eid, entity, card_map[eid])
+        for eid, entity in entity_map.items()
+        if eid is not None and card_map.get(eid)
+    ]
+    assertions_by_eid = fetch_assertions_for_entities([eid for eid, _entity, _card in targets])
+    all_assertions = itertools.chain.from_iterable(assertions_by_eid.values())
+    all_segment_ids = set().union(*(assertion.segment_ids for assertion in all_assertions))
+    seg_by_id = {seg.id: seg for seg in fetch_segments_by_ids(sorted(all_segment_ids))}
+    tasks = []
+    for eid, entity, card in targets:
+        assertions = assertions_by_eid[eid]
+        segment_ids = sorted(set().union(*(assertion.segment_ids for assertion in assertions)))
+        segments = [seg_by_id[sid] for sid in segment_ids if sid in seg_by_id]
+        tasks.append((card, entity, assertions, segments))
+    try:
+        vectors = prepare_query_vectors([_card_query_text(card) for card, *_rest in tasks], top_k=3)
+    except Exception:
+        vectors = [None] * len(tasks)
+
+    # Cards that map to the same file are rendered by one worker, in order, so merges don't race.
+    groups: dict[Path, list[int]] = {}
+    for idx, (card, entity, *_rest) in enumerate(tasks):
+        groups.setdefault(_card_path(card, entity, out_dir), []).append(idx)
+    paths: list[str] = [""] * len(tasks)
+
+    def render_group(indices: list[int]) -> None:
+        for idx in indices:
+            card, entity, assertions, segments = tasks[idx]
+            related = _related_chunks(card, vectors[idx])
+            paths[idx] = write_card_markdown(card, entity, assertions, segments, out_dir, related)
+
+    with ThreadPoolExecutor(max_workers=get_settings().export_workers) as executor:
+        list(executor.map(render_group, groups.values()))
     return paths
 
 
+def _card_path(card: TechCard | Row, entity: Entity | None, out_dir: str) -> Path:
+    slug = slugify(entity.canonical_name if entity else str(card.entity_id))
+    return Path(out_dir) / f"{slug}.md"
+
+
 def _build_frontmatter(
-    card: TechCard,
+    card: TechCard | Row,
     entity: Entity | None,
     assertions: list[Assertion],
     segments: list[Segment],
@@ -188,24 +232,37 @@ def _build_evidence_index(
     assertions: list[Assertion],
     segments: list[Segment],
 ) -> dict[int, dict[str, str]]:
-    segment_lookup = {seg.id: seg for seg in segments if seg.id is not None}
+    if not assertions:
+        return {}
     evidence: dict[int, dict[str, str]] = {}
+    if len(assertions) == 1 and len(segments) <= 4:
+        # Common single-assertion card: a linear scan beats building the lookup dict.
+        assertion = assertions[0]
+        for seg_id in assertion.segment_ids:
+            seg = next((seg for seg in reversed(segments) if seg.id == seg_id), None)
+            if seg:
+                evidence[seg_id] = _evidence_entry(assertion, seg)
+        return evidence
+    segment_lookup = {seg.id: seg for seg in segments if seg.id is not None}
     for assertion in assertions:
         for seg_id in assertion.segment_ids:
             seg = segment_lookup.get(seg_id)
             if not seg:
                 continue
-            timestamp = seconds_to_hms(seg.t_start_sec)
-            link = f" ({seg.youtube_url})" if seg.youtube_url else ""
-            label = f"{seg.speaker or 'Unknown'} @ {timestamp}{link}"
-            evidence[seg_id] = {
-                "label": label,
-                "quote": take_quote(assertion.evidence_quote or seg.text),
-            }
+            evidence[seg_id] = _evidence_entry(assertion, seg)
     return evidence
 
 
-def _format_key_points(card: TechCard, evidence_map: dict[int, dict[str, str]]) -> list[str]:
+def _evidence_entry(assertion: Assertion, seg: Segment) -> dict[str, str]:
+    timestamp = seconds_to_hms(seg.t_start_sec)
+    link = f" ({seg.youtube_url})" if seg.youtube_url else ""
+    return {
+        "label": f"{seg.speaker or 'Unknown'} @ {timestamp}{link}",
+        "quote": take_quote(assertion.evidence_quote or seg.text),
+    }
+
+
+def _format_key_points(card: TechCard | Row, evidence_map: dict[int, dict[str, str]]) -> list[str]:
     key_points = card.key_points or []
     if not key_points:
         return []
@@ -220,11 +277,11 @@ def _format_key_points(card: TechCard, evidence_map: dict[int, dict[str, str]])
 
 
 def _derive_open_questions(assertions: list[Assertion]) -> list[str]:
-    questions = []
-    for assertion in assertions:
-        if assertion.assertion_type == "prediction" or assertion.verify_priority >= 2:
-            questions.append(f"Validate: {assertion.statement}")
-    return questions
+    return [
+        f"Validate: {assertion.statement}"
+        for assertion in assertions
+        if assertion.assertion_type == "prediction" or assertion.verify_priority >= 2
+    ]
 
 
 def _build_change_entry(assertions: list[Assertion]) -> str:
@@ -235,64 +292,62 @@ def _build_change_entry(assertions: list[Assertion]) -> str:
     return f"- {today}: updated"
 
 
-def _related_chunks(card: TechCard) -> list[str]:
+def _card_query_text(card: TechCard | Row) -> str:
+    return " ".join(
+        [
+            card.short_definition or "",
+            " ".join(card.key_points or []),
+            " ".join(card.comparisons or []),
+            card.recent_summary or "",
+        ]
+    ).strip()
+
+
+def _related_chunks(card: TechCard | Row, vector: list[float] | None = None) -> list[str]:
     try:
-        settings = get_settings()
-        query_text = " ".join(
-            [
-                card.short_definition or "",
-                " ".join(card.key_points or []),
-                " ".join(card.comparisons or []),
-                card.recent_summary or "",
-            ]
-        ).strip()
-        if not query_text:
-            return []
-        vec = embed_query(query_text)
-        results = similarity_search_chunks(
-            vec, top_k=3, model_name=settings.embedding_model, dims=settings.embedding_dims
-        )
-        lines = []
-        for chunk, _distance in results:
-            label = f"Topic {chunk.topic_id} @ {seconds_to_hms(chunk.t_start_sec)}–{seconds_to_hms(chunk.t_end_sec)}"
-            lines.append(f"{label}: {chunk.chunk_text}")
-        return lines
+        results = cached_similarity_search(_card_query_text(card), top_k=3, vector=vector)
     except Exception:
         return []
+    return _format_related(results)
+
+
+def _format_related(results: list) -> list[str]:
+    lines = []
+    for chunk, _distance in results:
+        label = f"Topic {chunk.topic_id} @ {seconds_to_hms(chunk.t_start_sec)}–{seconds_to_hms(chunk.t_end_sec)}"
+        lines.append(f"{label}: {chunk.chunk_text}")
+    return lines
+
 
+def _parse_markdown(markdown: str) -> _ParsedMarkdown:
+    preamble, sections = _parse_markdown_body(markdown)
+    return _ParsedMarkdown(
+        preamble=preamble,
+        sections=sections,
+        change_log=_extract_change_log(markdown),
+    )
 
-def _merge_change_log(existing_markdown: str | None, new_entry: str) -> list[str]:
-    existing_entries = []
-    if existing_markdown:
-        _extract_frontmatter(existing_markdown)
-        existing_entries = _extract_change_log(existing_markdown)
-    entries = list(existing_entries)
+
+def _merge_change_log(existing: _ParsedMarkdown | None, new_entry: str) -> list[str]:
+    entries = list(existing.change_log) if existing else []
     if new_entry not in entries:
         entries.append(new_entry)
     return entries if entries else [new_entry]
 
 
 def _extract_change_log(markdown: str) -> list[str]:
-    lines = markdown.splitlines()
-    start_idx = None
-    for idx, line in enumerate(lines):
-        if line.strip().lower() == "## change log":
-            start_idx = idx + 1
-            break
-    if start_idx is None:
+    match = _CHANGE_LOG_HEADER.search(markdown)
+    if match is None:
         return []
-    entries = []
-    for line in lines[start_idx:]:
-        if line.startswith("## "):
-            break
-        if line.strip().startswith("-"):
-            entries.append(line.strip())
-    return entries
+    tail = markdown[match.end() :]
+    stop = tail.find("\n## ")
+    if stop != -1:
+        tail = tail[:stop]
+    return _CHANGE_LOG_ENTRY.findall(tail)
 
 
-def _merge_markdown(existing: str, generated: str) -> str:
-    existing_sections = _split_sections(existing)
-    generated_sections = _split_sections(generated)
+def _merge_markdown(existing: _ParsedMarkdown, generated: str) -> str:
+    _preamble, generated_sections = _parse_markdown_body(generated)
     merged_sections = []
     used = set()
 
@@ -300,13 +355,13 @@ def _merge_markdown(existing: str, generated: str) -> str:
         merged_sections.append((title, content))
         used.add(title)
 
-    for title, content in existing_sections:
+    for title, content in existing.sections:
         if title in used:
             continue
         merged_sections.append((title, content))
 
     frontmatter = _extract_frontmatter(generated)
-    preamble = _extract_preamble(existing)
+    preamble = existing.preamble
     lines = ["---", _dump_yaml(frontmatter).strip(), "---", ""]
     if preamble:
         lines.append(preamble.strip())
@@ -318,36 +373,23 @@ def _merge_markdown(existing: str, generated: str) -> str:
     return "\n".join(lines).strip() + "\n"
 
 
-def _split_sections(markdown: str) -> list[tuple[str, str]]:
+def _parse_markdown_body(markdown: str) -> tuple[str, list[tuple[str, str]]]:
     content = _strip_frontmatter(markdown)
-    lines = content.splitlines()
-    sections: list[tuple[str, list[str]]] = []
+    preamble_lines: list[str] = []
+    sections: list[tuple[str, str]] = []
     current_title = None
-    current_lines: list[str] = []
-    for line in lines:
+    current_lines = preamble_lines
+    for line in content.splitlines():
         if line.startswith("## "):
             if current_title is not None:
                 sections.append((current_title, "\n".join(current_lines).strip()))
             current_title = line[3:].strip()
             current_lines = []
             continue
-        if current_title is None:
-            continue
         current_lines.append(line)
     if current_title is not None:
         sections.append((current_title, "\n".join(current_lines).strip()))
-    return sections
-
-
-def _extract_preamble(markdown: str) -> str:
-    content = _strip_frontmatter(markdown)
-    lines = content.splitlines()
-    preamble_lines = []
-    for line in lines:
-        if line.startswith("## "):
-            break
-        preamble_lines.append(line)
-    return "\n".join(preamble_lines).strip()
+    return "\n".join(preamble_lines).strip(), sections
 
 
 def _strip_frontmatter(markdown: str) -> str:
@@ -400,7 +442,7 @@ def _yaml_fallback_parse(raw: str) -> dict[str, Any]:
     for line in raw.splitlines():
         if not line.strip():
             continue
-        if re.match(r"^[A-Za-z0-9_\\-]+:", line):
+        if _YAML_KEY_RE.match(line):
             key, _, value = line.partition(":")
             key = key.strip()
             value = value.strip()
@@ -16,6 +16,11 @@ class ChunkState(TypedDict, total=False):
     chunks: list
 
 
+def chunk_build_and_persist(state: ChunkState) -> ChunkState:
+    chunks = build_chunks_from_topics(state.get("topics", []), state.get("segments", []))
+    return {**state, "chunks": upsert_chunks(state["episode_id"], chunks)}
+
+
 def chunk_builder(state: ChunkState) -> ChunkState:
     topics = state.get("topics", [])
     segments = state.get("segments", [])
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterable
+from functools import lru_cache
+from typing import Iterable, Sequence
 
+import numpy as np
+
+from .config import get_settings
 from .schemas import Chunk, Topic, Segment
-from .utils import seconds_to_hms, estimate_tokens
+from .utils import seconds_to_hms
 
 
 def build_chunks_from_topics(
@@ -39,15 +43,14 @@ def build_chunks_from_topics(
 def _topic_ranges(topics: list[Topic], segments: list[Segment]) -> list[tuple[Topic | None, list[Segment]]]:
     if not topics:
         return [(None, segments)]
-    seg_ids = [seg.id for seg in segments if seg.id is not None]
+    seg_idx = {seg.id: i for i, seg in enumerate(segments) if seg.id is not None}
     ranges: list[tuple[Topic | None, list[Segment]]] = []
     for topic in topics:
-        if topic.start_seg_id in seg_ids and topic.end_seg_id in seg_ids:
-            start_idx = seg_ids.index(topic.start_seg_id)
-            end_idx = seg_ids.index(topic.end_seg_id)
-            if start_idx <= end_idx:
-                ranges.append((topic, segments[start_idx : end_idx + 1]))
-                continue
+        start_idx = seg_idx.get(topic.start_seg_id)
+        end_idx = seg_idx.get(topic.end_seg_id)
+        if start_idx is not None and end_idx is not None and start_idx <= end_idx:
+            ranges.append((topic, segments[start_idx : end_idx + 1]))
+            continue
         ranges.append((topic, segments))
     return ranges
 
@@ -60,40 +63,82 @@ def _build_topic_chunks(
     max_segs: int,
     overlap: int,
 ) -> list[Chunk]:
+    header = _topic_header(topic)
+    seg_texts = [_seg_text(seg) for seg in segments]
+    # Character counts of the joined, stripped chunk text, so the estimate matches
+    # estimate_tokens(chunk_text) exactly. Each segment carries its "\n" joiner; strip() can only
+    # trim the ends, since every segment text contains its "(hh:mm:ss)" stamp.
+    seg_chars: Sequence[int] = [len(text) + 1 for text in seg_texts]
+    lead_ws: Sequence[int] = [len(text) - len(text.lstrip()) for text in seg_texts]
+    trail_ws: Sequence[int] = [len(text) - len(text.rstrip()) for text in seg_texts]
+    shrink = _shrink_window
+    jitted = _shrink_window_jit() if get_settings().chunk_jit else None
+    if jitted is not None:
+        seg_chars = np.asarray(seg_chars, dtype=np.int64)
+        trail_ws = np.asarray(trail_ws, dtype=np.int64)
+        shrink = jitted
     chunks: list[Chunk] = []
     idx = 0
     total = len(segments)
     while idx < total:
-        window = segments[idx : min(total, idx + max_segs)]
-        if len(window) < min_segs:
-            break
-        chunk_text = _build_chunk_text(topic, window)
-        while estimate_tokens(chunk_text) > max_tokens and len(window) > min_segs:
-            window = window[:-1]
-            chunk_text = _build_chunk_text(topic, window)
-        if len(window) < min_segs:
+        end = min(total, idx + max_segs)
+        if end - idx < min_segs:
             break
-        chunks.append(_make_chunk(topic, window, chunk_text))
-        idx += max(1, len(window) - overlap)
+        # The header joins with its own "\n"; without one, the last joiner and leading space go.
+        fixed_chars = len(header) if header else -1 - lead_ws[idx]
+        end = idx + shrink(seg_chars[idx:end], trail_ws[idx:end], fixed_chars, max_tokens, min_segs)
+        chunk_text = _join_chunk_text(header, seg_texts[idx:end])
+        chunks.append(_make_chunk(topic, segments[idx:end], chunk_text))
+        idx += max(1, end - idx - overlap)
     return chunks
 
 
-def _build_chunk_text(topic: Topic | None, segments: list[Segment]) -> str:
-    lines = []
-    if topic:
-        lines.append(f"[Topic: {topic.name}]")
-    for seg in segments:
-        timestamp = seconds_to_hms(seg.t_start_sec)
-        link = f"[{seg.youtube_url}]" if seg.youtube_url else ""
-        lines.append(f"{seg.speaker or 'Unknown'} ({timestamp}){link}")
-        lines.append(seg.text)
+def _shrink_window(
+    seg_chars: Sequence[int], trail_ws: Sequence[int], fixed_chars: int, max_tokens: int, min_segs: int
+) -> int:
+    """Return how many leading segments fit in max_tokens, never dropping below min_segs.
+
+    Uses the same len // 4 estimate as estimate_tokens on the joined text.
+    """
+    size = len(seg_chars)
+    chars = fixed_chars
+    for i in range(size):
+        chars += seg_chars[i]
+    while max(1, (chars - trail_ws[size - 1]) // 4) > max_tokens and size > min_segs:
+        size -= 1
+        chars -= seg_chars[size]
+    return size
+
+
+@lru_cache(maxsize=1)
+def _shrink_window_jit():
+    # numba is only imported the first time CHUNK_JIT asks for it; plain runs never pay for it.
+    try:
+        from numba import njit
+    except Exception:  # pragma: no cover - numba is an optional speedup
+        return None
+    return njit(cache=True)(_shrink_window)
+
+
+def _topic_header(topic: Topic | None) -> str | None:
+    return f"[Topic: {topic.name}]" if topic else None
+
+
+def _seg_text(seg: Segment) -> str:
+    timestamp = seconds_to_hms(seg.t_start_sec)
+    link = f"[{seg.youtube_url}]" if seg.youtube_url else ""
+    return f"{seg.speaker or 'Unknown'} ({timestamp}){link}\n{seg.text}"
+
+
+def _join_chunk_text(header: str | None, seg_texts: list[str]) -> str:
+    lines = [header, *seg_texts] if header else seg_texts
     return "\n".join(lines).strip()
 
 
 def _make_chunk(topic: Topic | None, segments: list[Segment], chunk_text: str) -> Chunk:
     start = segments[0]
     end = segments[-1]
-    return Chunk(
+    return Chunk.model_construct(
         topic_id=topic.id if topic else None,
         start_seg_id=start.id,
         end_seg_id=end.id,
@@ -5,13 +5,15 @@ import json
 from pathlib import Path
 
 from .card_markdown import export_cards
-from .graph import build_ingest_graph, build_qa_graph
+from .db import get_session
 from .reporting import write_report
 from .storage import (
-    fetch_assertions_for_episode,
+    fetch_assertion_rows_for_episode,
     fetch_chunks_for_episode,
     fetch_episode,
+    fetch_episode_segment_rows,
     fetch_episode_segments,
+    fetch_topic_rows_for_episode,
     fetch_topics_for_episode,
     similarity_search_chunks,
 )
@@ -49,6 +51,8 @@ def _load_file_text(path: Path) -> str:
 
 
 def ingest_command(args: argparse.Namespace) -> None:
+    from .graph import build_ingest_graph
+
     graph = build_ingest_graph()
     if args.url:
         state = {"source_url": args.url, "refine_count": 0}
@@ -70,17 +74,19 @@ def ingest_command(args: argparse.Namespace) -> None:
 
 
 def report_command(args: argparse.Namespace) -> None:
-    episode = fetch_episode(args.episode)
-    if not episode:
-        raise SystemExit(f"Episode {args.episode} not found")
-    segments = fetch_episode_segments(args.episode)
-    topics = fetch_topics_for_episode(args.episode)
-    assertions = fetch_assertions_for_episode(args.episode)
-    write_report(episode, segments, topics, assertions, args.out, args.json_out)
+    with get_session() as session:
+        episode = fetch_episode(args.episode, session=session)
+        if not episode:
+            raise SystemExit(f"Episode {args.episode} not found")
+        segments = fetch_episode_segment_rows(args.episode, session=session)
+        topics = fetch_topic_rows_for_episode(args.episode, session=session)
+        assertions = fetch_assertion_rows_for_episode(args.episode, session=session)
+        write_report(episode, segments, topics, assertions, args.out, args.json_out, session=session)
 
 
 def ask_command(args: argparse.Namespace) -> None:
     from .config import get_settings
+    from .graph import build_qa_graph
 
     settings = get_settings()
     if not settings.openai_api_key:
@@ -128,7 +134,7 @@ def search_command(args: argparse.Namespace) -> None:
         return
     for chunk, distance in results:
         print(f"- (distance {distance:.4f}) Episode {chunk.episode_id} | Topic {chunk.topic_id}")
-        print(chunk.chunk_text.splitlines()[0])
+        print(chunk.chunk_text.partition("\n")[0])
 
 
 def main() -> None:
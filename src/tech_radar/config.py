@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 
 from dotenv import load_dotenv
 
@@ -19,8 +20,18 @@ class Settings:
     stub_llm: bool
     embedding_model: str
     embedding_dims: int
+    qvcache_tau: float
+    qvcache_capacity: int
+    cache_dir: str
+    export_workers: int
+    chunk_jit: bool
+    llm_cache_tau: float
+    hash_algorithm: str
+    html_parser: str
+    hnsw_ef_search: int
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings(
         openai_api_key=os.getenv("OPENAI_API_KEY"),
@@ -32,4 +43,17 @@ def get_settings() -> Settings:
         stub_llm=os.getenv("TECH_RADAR_STUB_LLM", "false").lower() == "true",
         embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
         embedding_dims=int(os.getenv("EMBEDDING_DIMS", os.getenv("VECTOR_DIM", "1536"))),
+        qvcache_tau=float(os.getenv("QVCACHE_TAU", "0.95")),
+        qvcache_capacity=int(os.getenv("QVCACHE_CAPACITY", "1024")),
+        cache_dir=os.getenv("CACHE_DIR", "~/.cache/tech_radar"),
+        export_workers=max(1, int(os.getenv("EXPORT_WORKERS", "8"))),
+        chunk_jit=os.getenv("CHUNK_JIT", "false").lower() == "true",
+        llm_cache_tau=float(os.getenv("LLM_CACHE_TAU", "0.92")),
+        hash_algorithm=os.getenv("HASH_ALGORITHM", "sha256").lower(),
+        html_parser=os.getenv("HTML_PARSER", "auto").lower(),
+        hnsw_ef_search=int(os.getenv("HNSW_EF_SEARCH", "40")),
     )
+
+
+def reset_settings() -> None:
+    get_settings.cache_clear()
@@ -8,8 +8,7 @@ from sqlalchemy.orm import Session, sessionmaker
 from .config import get_settings
 
 
-_settings = get_settings()
-_engine = create_engine(_settings.database_url, future=True)
+_engine = create_engine(get_settings().database_url, future=True)
 SessionLocal = sessionmaker(bind=_engine, class_=Session, expire_on_commit=False)
 
 
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
-from typing import Iterable
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterable
+
+import numpy as np
 
 from .config import get_settings
+from .embeddings_cache import load_vectors, store_vectors
 from .models import Chunk
-from .storage import fetch_embeddings, upsert_embeddings
+from .sqlite_cache import unit_vector
+from .storage import fetch_objects_needing_embeddings, similarity_search_chunks, upsert_embeddings
 from .utils import compact_spaces
 
+_EMBED_BATCH_SIZE = 96
+_EMBED_WORKERS = 4
+
 
+@lru_cache(maxsize=1)
 def _embedding_client():
     settings = get_settings()
     if not settings.openai_api_key:
@@ -17,18 +29,25 @@ def _embedding_client():
     return OpenAIEmbeddings(model=settings.embedding_model)
 
 
+def reset_embedding_client() -> None:
+    _embedding_client.cache_clear()
+
+
 def embed_chunks(chunks: Iterable[Chunk]) -> int:
     settings = get_settings()
     items = [chunk for chunk in chunks if chunk.id is not None]
     if not items:
         return 0
-    existing = fetch_embeddings("chunk", [chunk.id for chunk in items], settings.embedding_model, settings.embedding_dims)
-    missing = [chunk for chunk in items if chunk.id not in existing]
+    pending = set(
+        fetch_objects_needing_embeddings(
+            "chunk", [chunk.id for chunk in items], settings.embedding_model, settings.embedding_dims
+        )
+    )
+    missing = [chunk for chunk in items if chunk.id in pending]
     if not missing:
         return 0
-    client = _embedding_client()
     texts = [compact_spaces(chunk.chunk_text) for chunk in missing]
-    vectors = client.embed_documents(texts)
+    vectors = _embed_with_cache(texts, _embed_documents_batched)
     upsert_embeddings(
         "chunk",
         [chunk.id for chunk in missing],
@@ -40,5 +59,165 @@ def embed_chunks(chunks: Iterable[Chunk]) -> int:
 
 
 def embed_query(text: str) -> list[float]:
+    return _embed_with_cache([text], lambda batch: [_embedding_client().embed_query(batch[0])])[0]
+
+
+def _embed_with_cache(
+    texts: list[str], embed: Callable[[list[str]], list[list[float]]]
+) -> list[list[float]]:
+    settings = get_settings()
+    vectors = load_vectors(texts, settings.embedding_model, settings.embedding_dims)
+    missing = [idx for idx, vec in enumerate(vectors) if vec is None]
+    if missing:
+        missing_texts = [texts[idx] for idx in missing]
+        fresh = embed(missing_texts)
+        store_vectors(missing_texts, fresh, settings.embedding_model, settings.embedding_dims)
+        for idx, vec in zip(missing, fresh):
+            vectors[idx] = vec
+    return vectors
+
+
+def _embed_documents_batched(texts: list[str]) -> list[list[float]]:
     client = _embedding_client()
-    return client.embed_query(text)
+    batches = [texts[i : i + _EMBED_BATCH_SIZE] for i in range(0, len(texts), _EMBED_BATCH_SIZE)]
+    if len(batches) <= 1:
+        return client.embed_documents(texts) if texts else []
+    with ThreadPoolExecutor(max_workers=_EMBED_WORKERS) as executor:
+        return [vec for batch in executor.map(client.embed_documents, batches) for vec in batch]
+
+
+@lru_cache(maxsize=1024)
+def _embed_query_cached(text: str) -> tuple[float, ...]:
+    return tuple(embed_query(text))
+
+
+class _SemanticQueryCache:
+    """LRU of search results keyed by query text, with a cosine fallback for near-duplicates.
+
+    Unit vectors live in one preallocated float32 matrix so the near-duplicate scan is a
+    single matrix-vector product. All access goes through a lock so export workers can
+    share one instance.
+    """
+
+    def __init__(self, capacity: int, tau: float) -> None:
+        self.capacity = capacity
+        self.tau = tau
+        self._matrix: np.ndarray | None = None
+        self._scope_ids = np.full(capacity, -1, dtype=np.int64)
+        self._scopes: dict[tuple, int] = {}
+        self._rows: OrderedDict[tuple, int] = OrderedDict()
+        self._keys: list[tuple | None] = [None] * capacity
+        self._results: list[list | None] = [None] * capacity
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: tuple) -> list | None:
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            self._rows.move_to_end(key)
+            return self._results[row]
+
+    def nearest(self, scope: tuple, vec: np.ndarray) -> list | None:
+        with self._lock:
+            scope_id = self._scopes.get(scope)
+            if self._matrix is None or scope_id is None or self._matrix.shape[1] != vec.shape[0]:
+                return None
+            sims = self._matrix[: self._size] @ vec
+            sims[self._scope_ids[: self._size] != scope_id] = -np.inf
+            row = int(np.argmax(sims))
+            if sims[row] < self.tau:
+                return None
+            return self.get(self._keys[row])
+
+    def put(self, key: tuple, scope: tuple, vec: np.ndarray, results: list) -> None:
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != vec.shape[0]:
+                self._reset(vec.shape[0])
+            row = self._rows.get(key)
+            if row is None:
+                if self._size < self.capacity:
+                    row = self._size
+                    self._size += 1
+                else:
+                    _evicted, row = self._rows.popitem(last=False)
+            self._matrix[row] = vec
+            self._scope_ids[row] = self._scopes.setdefault(scope, len(self._scopes))
+            self._keys[row] = key
+            self._results[row] = results
+            self._rows[key] = row
+            self._rows.move_to_end(key)
+
+    def _reset(self, dims: int) -> None:
+        self._matrix = np.zeros((self.capacity, dims), dtype=np.float32)
+        self._scope_ids.fill(-1)
+        self._rows.clear()
+        self._size = 0
+
+
+_query_cache: _SemanticQueryCache | None = None
+_query_cache_lock = threading.Lock()
+
+
+def _get_query_cache() -> _SemanticQueryCache:
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            settings = get_settings()
+            _query_cache = _SemanticQueryCache(settings.qvcache_capacity, settings.qvcache_tau)
+        return _query_cache
+
+
+def embed_queries(texts: list[str]) -> list[list[float]]:
+    if not texts:
+        return []
+    return _embed_with_cache(texts, _embed_documents_batched)
+
+
+def prepare_query_vectors(
+    query_texts: list[str], top_k: int = 3, episode_id: int | None = None
+) -> list[list[float] | None]:
+    """Embed, in one batched request, every query the search cache cannot answer exactly.
+
+    Entries are None for empty queries and for queries that are already cached.
+    """
+    cache = _get_query_cache()
+    normalized = [compact_spaces(text).lower() for text in query_texts]
+    pending: dict[str, str] = {}
+    for norm, text in zip(normalized, query_texts):
+        if norm and cache.get((norm, top_k, episode_id)) is None:
+            pending.setdefault(norm, text)
+    vectors = dict(zip(pending, embed_queries(list(pending.values()))))
+    return [vectors.get(norm) for norm in normalized]
+
+
+def cached_similarity_search(
+    query_text: str,
+    top_k: int = 3,
+    episode_id: int | None = None,
+    vector: list[float] | None = None,
+) -> list[tuple[Chunk, float]]:
+    normalized = compact_spaces(query_text).lower()
+    if not normalized:
+        return []
+    cache = _get_query_cache()
+    scope = (top_k, episode_id)
+    key = (normalized, *scope)
+    results = cache.get(key)
+    if results is not None:
+        return results
+    vec = list(vector) if vector is not None else list(_embed_query_cached(query_text))
+    unit = unit_vector(vec)
+    results = cache.nearest(scope, unit)
+    if results is None:
+        settings = get_settings()
+        results = similarity_search_chunks(
+            vec,
+            top_k=top_k,
+            episode_id=episode_id,
+            model_name=settings.embedding_model,
+            dims=settings.embedding_dims,
+        )
+    cache.put(key, scope, unit, results)
+    return results
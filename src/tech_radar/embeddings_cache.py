@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+
+from .sqlite_cache import SqliteCache
+
+_SQLITE_BATCH = 500
+
+_cache = SqliteCache(
+    "embeddings.sqlite3",
+    "CREATE TABLE IF NOT EXISTS embeddings ("
+    "hash TEXT NOT NULL, model TEXT NOT NULL, dims INTEGER NOT NULL, vec BLOB NOT NULL, "
+    "PRIMARY KEY (hash, model, dims))",
+)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_vectors(texts: list[str], model: str, dims: int) -> list[list[float] | None]:
+    keys = [text_hash(text) for text in texts]
+    found: dict[str, bytes] = {}
+    with _cache.lock:
+        conn = _cache.connection()
+        if conn is None:
+            return [None] * len(texts)
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), _SQLITE_BATCH):
+            batch = unique[start : start + _SQLITE_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT hash, vec FROM embeddings WHERE model = ? AND dims = ? AND hash IN ({placeholders})",
+                (model, dims, *batch),
+            )
+            found.update(rows)
+    return [np.frombuffer(found[key], dtype=np.float32).tolist() if key in found else None for key in keys]
+
+
+def store_vectors(texts: list[str], vectors: list[list[float]], model: str, dims: int) -> None:
+    rows = [
+        (text_hash(text), model, dims, np.asarray(vec, dtype=np.float32).tobytes())
+        for text, vec in zip(texts, vectors)
+    ]
+    with _cache.lock:
+        conn = _cache.connection()
+        if conn is None or not rows:
+            return
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
@@ -4,10 +4,11 @@ import json
 from pathlib import Path
 from typing import Any, Type
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import ValidationError
 
+from . import llm_cache
 from .config import get_settings
-from .schemas import CardResult, EntityResult, AssertionResult, TopicResult
+from .schemas import CardResult, EntityResult, AssertionResult, EpisodeAnalysisResult, TopicResult
 from .utils import take_quote
 
 
@@ -20,29 +21,53 @@ def get_chat_model():
     return ChatOpenAI(model=settings.model, temperature=settings.temperature)
 
 
+# The refine loop re-enters the "assertions" node for a fresh answer; a replay would defeat it.
+_UNCACHED_TASKS = {"assertions"}
+
+
 def call_json(task: str, system_prompt: str, user_prompt: str, schema: Type[Any], context: dict) -> Any:
     settings = get_settings()
     if settings.stub_llm:
         return _stub(task, context, schema)
 
-    model = get_chat_model()
+    if task in _UNCACHED_TASKS:
+        return _invoke_json(task, system_prompt, user_prompt, schema, context)
+    key = llm_cache.response_key(
+        task, system_prompt, user_prompt, schema.__name__, settings.model, settings.temperature
+    )
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return schema.model_validate_json(cached)
+    result = _invoke_json(task, system_prompt, user_prompt, schema, context)
+    llm_cache.put(key, result.model_dump_json())
+    return result
+
+
+def _invoke_json(task: str, system_prompt: str, user_prompt: str, schema: Type[Any], context: dict) -> Any:
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    # One round trip that still carries the schema; non-strict, so Pydantic stays the validator.
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            "schema": schema.model_json_schema(),
+            "strict": False,
+        },
+    }
+    model = get_chat_model().bind(response_format=response_format)
+    messages = [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
     last_raw = None
-    for _attempt in range(3):
+    last_error: Exception | None = None
+    for _attempt in range(2):
+        raw = model.invoke(messages).content
+        last_raw = raw
         try:
-            structured = model.with_structured_output(schema, method="function_calling")
-            return structured.invoke([SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)])
-        except Exception:
-            message = model.invoke([SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)])
-            raw = message.content
-            last_raw = raw
-            cleaned = _strip_code_fences(raw)
-            try:
-                data = json.loads(cleaned)
-            except json.JSONDecodeError:
-                continue
-            data = _normalize_payload(task, data, context)
+            data = _normalize_payload(task, json.loads(_strip_code_fences(raw)), context)
             return schema.model_validate(data)
-    raise ValueError(f"LLM returned non-JSON for {task}: {last_raw}")
+        except (json.JSONDecodeError, ValidationError) as exc:
+            last_error = exc
+    raise ValueError(f"LLM returned invalid JSON for {task}: {last_error}\n{last_raw}")
 
 
 def _stub(task: str, context: dict, schema: Type[Any]) -> Any:
@@ -72,19 +97,23 @@ def _stub(task: str, context: dict, schema: Type[Any]) -> Any:
                 }
             ]
         )
+    if task == "episode_analysis":
+        return EpisodeAnalysisResult(
+            topics=_stub("topics", context, TopicResult).topics,
+            entities=_stub("entities", context, EntityResult).entities,
+            assertions=_stub("assertions", context, AssertionResult).assertions,
+        )
     if task == "cards":
-        entities = context.get("entities", [])
-        cards = []
-        for entity in entities:
-            cards.append(
-                {
-                    "entity_id": entity.id or 0,
-                    "short_definition": f"{entity.canonical_name} is a key concept discussed.",
-                    "key_points": ["Appears in the transcript"],
-                    "comparisons": [],
-                    "recent_summary": "No recent updates in this episode.",
-                }
-            )
+        cards = [
+            {
+                "entity_id": entity.id or 0,
+                "short_definition": entity.canonical_name + " is a key concept discussed.",
+                "key_points": ["Appears in the transcript"],
+                "comparisons": [],
+                "recent_summary": "No recent updates in this episode.",
+            }
+            for entity in context.get("entities", [])
+        ]
         return CardResult(cards=cards, needs_refine=False)
     raise ValueError(f"Unknown stub task {task}")
 
@@ -104,9 +133,18 @@ def _normalize_payload(task: str, data: Any, context: dict) -> Any:
     if task == "entities" and isinstance(data, list):
         return {"entities": data}
     if task == "assertions" and isinstance(data, list):
-        return {"assertions": data}
+        data = {"assertions": data}
     if task == "cards" and isinstance(data, list):
         return {"cards": data, "needs_refine": False}
+    if task in {"assertions", "episode_analysis"} and isinstance(data, dict):
+        # The prompt never shows the model the episode id; fill it in rather than fail validation.
+        episode_id = context.get("episode_id")
+        assertions = data.get("assertions")
+        if episode_id is not None and isinstance(assertions, list):
+            for item in assertions:
+                if isinstance(item, dict):
+                    item.setdefault("episode_id", episode_id)
+        return data
     if task == "query_optimizer":
         if isinstance(data, dict):
             time_hint = data.get("time_hint")
@@ -124,7 +162,7 @@ def _normalize_payload(task: str, data: Any, context: dict) -> Any:
                     queries.append(f"{ent} {question}".strip())
                 while len(queries) < 3:
                     queries.append(question or "AI podcast transcript")
-                data["queries"] = list(dict.fromkeys(queries))[:6]
+                data["queries"] = _first_unique(queries, 6)
             if "retrieval_plan" not in data:
                 data["retrieval_plan"] = {
                     "use_tech_cards": True,
@@ -138,5 +176,17 @@ def _normalize_payload(task: str, data: Any, context: dict) -> Any:
     return data
 
 
+def _first_unique(items: list[str], limit: int) -> list[str]:
+    seen: set[str] = set()
+    out: list[str] = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            out.append(item)
+            if len(out) == limit:
+                break
+    return out
+
+
 def load_prompt(path: str) -> str:
     return Path(path).read_text(encoding="utf-8")
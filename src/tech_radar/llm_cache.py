@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+import numpy as np
+
+from .sqlite_cache import SqliteCache, unit_vector
+
+_cache = SqliteCache(
+    "llm.sqlite3",
+    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS answers ("
+    "id INTEGER PRIMARY KEY, model TEXT NOT NULL, scope TEXT NOT NULL, "
+    "vec BLOB NOT NULL, value TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS answers_model_scope ON answers (model, scope)",
+)
+
+
+def response_key(
+    task: str, system: str, user: str, schema: str, model: str, temperature: float
+) -> str:
+    payload = {
+        "task": task,
+        "system": system,
+        "user": user,
+        "schema": schema,
+        "model": model,
+        "temperature": temperature,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> str | None:
+    with _cache.lock:
+        conn = _cache.connection()
+        if conn is None:
+            return None
+        row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def put(key: str, value: str) -> None:
+    with _cache.lock:
+        conn = _cache.connection()
+        if conn is None:
+            return
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?)", (key, value))
+
+
+def find_answer(vec: list[float], model: str, scope: str, tau: float) -> dict | None:
+    """Return the cached answer whose question vector is closest to vec, if cosine >= tau."""
+    query = unit_vector(vec)
+    with _cache.lock:
+        conn = _cache.connection()
+        if conn is None:
+            return None
+        rows = conn.execute(
+            "SELECT vec, value FROM answers WHERE model = ? AND scope = ?", (model, scope)
+        ).fetchall()
+    rows = [(blob, value) for blob, value in rows if len(blob) == query.nbytes]
+    if not rows:
+        return None
+    matrix = np.frombuffer(b"".join(blob for blob, _value in rows), dtype=np.float32)
+    sims = matrix.reshape(len(rows), -1) @ query
+    best = int(np.argmax(sims))
+    if sims[best] < tau:
+        return None
+    return json.loads(rows[best][1])
+
+
+def store_answer(vec: list[float], model: str, scope: str, answer: dict) -> None:
+    blob = unit_vector(vec).tobytes()
+    with _cache.lock:
+        conn = _cache.connection()
+        if conn is None:
+            return
+        with conn:
+            conn.execute(
+                "INSERT INTO answers (model, scope, vec, value) VALUES (?, ?, ?, ?)",
+                (model, scope, blob, json.dumps(answer, ensure_ascii=False)),
+            )
+
@@ -16,9 +16,15 @@ def run_init() -> None:
     if settings.use_pgvector:
         pgvector_sql = root / "migrations" / "0001_pgvector.sql"
         run_sql_file(str(pgvector_sql))
-    extra = root / "migrations" / "0002_chunks_embeddings.sql"
-    if extra.exists():
-        run_sql_file(str(extra))
+    for name in (
+        "0002_chunks_embeddings.sql",
+        "0003_extraction_cache.sql",
+        "0004_chunk_embedding_hnsw.sql",
+        "0005_chunks_episode_time_idx.sql",
+    ):
+        extra = root / "migrations" / name
+        if extra.exists():
+            run_sql_file(str(extra))
 
 
 def main() -> None:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import datetime as dt
 
-from sqlalchemy import CheckConstraint, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import CheckConstraint, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from pgvector.sqlalchemy import Vector
@@ -67,6 +67,10 @@ class Chunk(Base):
     chunk_hash: Mapped[str] = mapped_column(String, unique=True)
     created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_chunks_episode_tstart", "episode_id", t_start_sec.nulls_first(), "id"),
+    )
+
 
 class ChunkSegment(Base):
     __tablename__ = "chunk_segments"
@@ -130,3 +134,12 @@ class Embedding(Base):
     __table_args__ = (
         CheckConstraint("object_type IN ('segment', 'card', 'assertion', 'chunk')"),
     )
+
+
+class ExtractionCache(Base):
+    __tablename__ = "extraction_cache"
+
+    rollup: Mapped[str] = mapped_column(String, primary_key=True)
+    task: Mapped[str] = mapped_column(String, primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSONB)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
@@ -1,21 +1,34 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TypedDict
+import hashlib
 import json
+import re
+from pathlib import Path
 
+import numpy as np
 from langgraph.graph import END
 
-from .llm import call_json
+from . import llm_cache
+from .config import get_settings
+from .embeddings import embed_chunks, embed_queries, embed_query
+from .llm import call_json, get_chat_model, load_prompt
 from .parsers.generic import GenericTextParser
 from .parsers.lex import LexTranscriptParser
 from .schemas import Assertion as AssertionSchema
 from .schemas import AssertionResult, CardResult, EntityResult, TopicResult, QueryOptimizationResult
+from .schemas import EpisodeAnalysisResult
 from .schemas import Segment as SegmentSchema
 from .schemas import TranscriptParseResult
 from .storage import (
+    fetch_chunks_for_episode,
     fetch_episode_segments,
-    fetch_segment_ids_for_chunk,
+    fetch_extraction,
+    fetch_segment_ids_for_chunks,
     fetch_segments_by_ids,
+    similarity_search_chunks_multi,
+    store_extraction,
     upsert_assertions,
     upsert_cards,
     upsert_entities,
@@ -25,6 +38,46 @@ from .storage import (
 )
 from .utils import take_quote
 
+_TOPICS_SYSTEM = (
+    "You cluster transcript segments into topics. Return JSON with topics: "
+    "[{name, summary, start_seg_id, end_seg_id}]."
+)
+_ENTITIES_SYSTEM = (
+    "Extract technology entities and return JSON {entities:[{type, canonical_name, aliases}]}. "
+    "Entity types: model, company, framework, hardware, benchmark, paper, product, concept."
+)
+_ASSERTIONS_SYSTEM = (
+    "Extract assertions with evidence. Return JSON {assertions:[{episode_id, entity_id, "
+    "assertion_type, statement, speaker, confidence, verify_priority, segment_ids, evidence_quote}]}. "
+    "evidence_quote must be <= 240 chars and copied from the transcript."
+)
+_ANALYSIS_SYSTEM = (
+    "Analyze the transcript segments in one pass and return JSON {topics, entities, assertions}. "
+    "topics: cluster segments into [{name, summary, start_seg_id, end_seg_id}]. "
+    "entities: technology entities [{type, canonical_name, aliases}] with type one of model, "
+    "company, framework, hardware, benchmark, paper, product, concept. "
+    "assertions: claims with evidence [{episode_id, entity_id, assertion_type, statement, speaker, "
+    "confidence, verify_priority, segment_ids, evidence_quote}]; evidence_quote must be <= 240 "
+    "chars and copied from the transcript."
+)
+
+
+@dataclass(frozen=True)
+class SegmentColumns:
+    """Parallel id/speaker/text columns for scanning segments without per-model attribute access."""
+
+    ids: list[int | None]
+    speakers: list[str | None]
+    texts: list[str]
+
+    @classmethod
+    def from_segments(cls, segments: list) -> SegmentColumns:
+        return cls(
+            ids=[seg.id for seg in segments],
+            speakers=[seg.speaker for seg in segments],
+            texts=[seg.text for seg in segments],
+        )
+
 
 class GraphState(TypedDict, total=False):
     source_url: str
@@ -32,6 +85,8 @@ class GraphState(TypedDict, total=False):
     episode_id: int
     episode_title: str | None
     segments: list[SegmentSchema]
+    segment_columns: SegmentColumns
+    seg_lines: str
     topics: list
     chunks: list
     entities: list
@@ -63,72 +118,127 @@ def parse_and_segment(state: GraphState) -> GraphState:
         result = GenericTextParser().parse(merged)
     episode = upsert_episode(result.episode)
     stored_segments = upsert_segments(episode.id, result.segments)
+    # Rows come straight from the segments table, so skip re-validating every field.
+    segments = [
+        SegmentSchema.model_construct(
+            id=seg.id,
+            episode_id=seg.episode_id,
+            speaker=seg.speaker,
+            t_start_sec=seg.t_start_sec,
+            t_end_sec=seg.t_end_sec,
+            youtube_url=seg.youtube_url,
+            text=seg.text,
+            hash=seg.hash,
+        )
+        for seg in stored_segments
+    ]
+    columns = SegmentColumns.from_segments(segments)
     return {
         **state,
         "episode_id": episode.id,
         "episode_title": episode.title,
-        "segments": [
-            SegmentSchema(
-                id=seg.id,
-                episode_id=seg.episode_id,
-                speaker=seg.speaker,
-                t_start_sec=seg.t_start_sec,
-                t_end_sec=seg.t_end_sec,
-                youtube_url=seg.youtube_url,
-                text=seg.text,
-                hash=seg.hash,
-            )
-            for seg in stored_segments
-        ],
+        "segments": segments,
+        "segment_columns": columns,
+        "seg_lines": _segment_lines(columns),
+    }
+
+
+def episode_analyzer(state: GraphState) -> GraphState:
+    segments = state["segments"]
+    episode_id = state["episode_id"]
+    try:
+        result: EpisodeAnalysisResult = _extract(
+            state,
+            "episode_analysis",
+            _ANALYSIS_SYSTEM,
+            EpisodeAnalysisResult,
+            {"segments": segments, "episode_id": episode_id},
+        )
+    except ValueError:
+        # Fall back to one call per task when the combined payload doesn't validate.
+        return assertion_extractor(entity_extractor(topic_threader(state)))
+    return {
+        **state,
+        "topics": upsert_topics(episode_id, result.topics),
+        "entities": upsert_entities(episode_id, result.entities),
+        "assertions": upsert_assertions(_clean_assertions(result.assertions, segments, episode_id)),
     }
 
 
 def topic_threader(state: GraphState) -> GraphState:
     segments = state["segments"]
-    lines = [f"{seg.id} | {seg.speaker or 'Unknown'} | {seg.text}" for seg in segments]
-    system = (
-        "You cluster transcript segments into topics. Return JSON with topics: "
-        "[{name, summary, start_seg_id, end_seg_id}]."
-    )
-    user = "\n".join(lines)
-    result: TopicResult = call_json("topics", system, user, TopicResult, {"segments": segments})
+    result: TopicResult = _extract(state, "topics", _TOPICS_SYSTEM, TopicResult, {"segments": segments})
     stored = upsert_topics(state["episode_id"], result.topics)
     return {**state, "topics": stored}
 
 
 def entity_extractor(state: GraphState) -> GraphState:
     segments = state["segments"]
-    lines = [f"{seg.id} | {seg.speaker or 'Unknown'} | {seg.text}" for seg in segments]
-    system = (
-        "Extract technology entities and return JSON {entities:[{type, canonical_name, aliases}]}. "
-        "Entity types: model, company, framework, hardware, benchmark, paper, product, concept."
-    )
-    user = "\n".join(lines)
-    result: EntityResult = call_json("entities", system, user, EntityResult, {"segments": segments})
+    result: EntityResult = _extract(state, "entities", _ENTITIES_SYSTEM, EntityResult, {"segments": segments})
     stored = upsert_entities(state["episode_id"], result.entities)
     return {**state, "entities": stored}
 
 
 def assertion_extractor(state: GraphState) -> GraphState:
     segments = state["segments"]
-    lines = [f"{seg.id} | {seg.speaker or 'Unknown'} | {seg.text}" for seg in segments]
-    system = (
-        "Extract assertions with evidence. Return JSON {assertions:[{episode_id, entity_id, "
-        "assertion_type, statement, speaker, confidence, verify_priority, segment_ids, evidence_quote}]}. "
-        "evidence_quote must be <= 240 chars and copied from the transcript."
-    )
-    user = "\n".join(lines)
     result: AssertionResult = call_json(
         "assertions",
-        system,
-        user,
+        _ASSERTIONS_SYSTEM,
+        _state_lines(state),
         AssertionResult,
         {"segments": segments, "episode_id": state["episode_id"]},
     )
+    stored = upsert_assertions(_clean_assertions(result.assertions, segments, state["episode_id"]))
+    return {**state, "assertions": stored}
+
+
+def _extract(state: GraphState, task: str, system: str, schema: type, context: dict):
+    """call_json, memoized in Postgres on the episode's segment hashes, prompt and model.
+
+    Re-ingesting an unchanged episode replays the stored episode analysis, first-pass
+    assertions included. The refine loop goes through assertion_extractor, which is not
+    routed through here, so a refine pass still asks the model for a new answer.
+    """
+    user = _state_lines(state)
+    settings = get_settings()
+    if settings.stub_llm:
+        return call_json(task, system, user, schema, context)
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (settings.model, system, *(seg.hash or "" for seg in state["segments"])):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    rollup = digest.hexdigest()
+    payload = fetch_extraction(rollup, task)
+    if payload is not None:
+        return schema.model_validate(payload)
+    result = call_json(task, system, user, schema, context)
+    store_extraction(rollup, task, result.model_dump(mode="json"))
+    return result
+
+
+def _segment_lines(columns: SegmentColumns) -> str:
+    return "\n".join(
+        f"{seg_id} | {speaker or 'Unknown'} | {text}"
+        for seg_id, speaker, text in zip(columns.ids, columns.speakers, columns.texts)
+    )
+
+
+def _state_lines(state: GraphState) -> str:
+    # parse_and_segment renders the transcript once; refine passes reuse it.
+    return state.get("seg_lines") or _segment_lines(_state_columns(state, state["segments"]))
+
+
+def _state_columns(state: GraphState, segments: list) -> SegmentColumns:
+    return state.get("segment_columns") or SegmentColumns.from_segments(segments)
+
+
+def _clean_assertions(
+    raw: list[AssertionSchema], segments: list[SegmentSchema], episode_id: int
+) -> list[AssertionSchema]:
     seg_lookup = {seg.id: seg for seg in segments if seg.id is not None}
     assertions: list[AssertionSchema] = []
-    for assertion in result.assertions:
-        assertion.episode_id = state["episode_id"]
+    for assertion in raw:
+        assertion.episode_id = episode_id
         assertion.segment_ids = [sid for sid in assertion.segment_ids if sid in seg_lookup]
         if not assertion.segment_ids:
             continue
@@ -141,8 +251,7 @@ def assertion_extractor(state: GraphState) -> GraphState:
                 quote = take_quote(assertion.statement, 240)
         assertion.evidence_quote = quote
         assertions.append(assertion)
-    stored = upsert_assertions(assertions)
-    return {**state, "assertions": stored}
+    return assertions
 
 
 def card_upserter(state: GraphState) -> GraphState:
@@ -152,8 +261,12 @@ def card_upserter(state: GraphState) -> GraphState:
         "Build tech cards. Return JSON {cards:[{entity_id, short_definition, key_points, "
         "comparisons, recent_summary}], needs_refine}."
     )
-    user = f"Entities: {[(e.id, e.canonical_name, e.type) for e in entities]}\n"
-    user += f"Assertions: {[(a.entity_id, a.statement) for a in assertions]}"
+    user = _compact_json(
+        {
+            "entities": [(e.id, e.canonical_name, e.type) for e in entities],
+            "assertions": [(a.entity_id, a.statement) for a in assertions],
+        }
+    )
     result: CardResult = call_json(
         "cards", system, user, CardResult, {"entities": entities, "assertions": assertions}
     )
@@ -170,9 +283,6 @@ def card_upserter(state: GraphState) -> GraphState:
 
 
 def indexer(state: GraphState) -> GraphState:
-    from .embeddings import embed_chunks
-    from .storage import fetch_chunks_for_episode
-
     chunks = state.get("chunks") or fetch_chunks_for_episode(state["episode_id"])
     embed_chunks(chunks)
     return state
@@ -182,44 +292,49 @@ def qa_chain(state: GraphState) -> GraphState:
     question = state["question"]
     mode = state.get("mode", "fast")
     optimized = state.get("optimized")
-    segments = state.get("segments") or fetch_episode_segments(state["episode_id"])
+    settings = get_settings()
+    use_cache = mode != "verify"
+    answer_scope = str(state.get("episode_id"))
+    question_vec = None
+    if use_cache:
+        try:
+            question_vec = embed_query(question)
+            cached_answer = llm_cache.find_answer(
+                question_vec, settings.embedding_model, answer_scope, settings.llm_cache_tau
+            )
+        except Exception:
+            cached_answer = None
+        if cached_answer is not None:
+            return {**state, "answer": cached_answer}
     hits = []
     try:
-        from .embeddings import embed_query
-        from .storage import similarity_search_chunks
-        from .config import get_settings
-
-        settings = get_settings()
         queries = [question]
         top_k = 8
         if optimized and optimized.queries:
             queries = optimized.queries
             top_k = optimized.retrieval_plan.top_k_chunks
-        chunk_scores: dict[int, float] = {}
-        for q in queries:
-            query_vec = embed_query(q)
-            chunk_results = similarity_search_chunks(
-                query_vec,
-                top_k=top_k,
-                episode_id=state.get("episode_id"),
-                model_name=settings.embedding_model,
-                dims=settings.embedding_dims,
-            )
-            for chunk, distance in chunk_results:
-                score = 1.0 / (1.0 + distance)
-                chunk_scores[chunk.id] = max(chunk_scores.get(chunk.id, 0.0), score)
-        chunk_ids = sorted(chunk_scores.keys(), key=lambda cid: chunk_scores[cid], reverse=True)
-        chunk_segment_ids = []
-        for chunk_id in chunk_ids:
-            chunk_segment_ids.extend(fetch_segment_ids_for_chunk(chunk_id))
-        chunk_segment_ids = list(dict.fromkeys(chunk_segment_ids))
-        hits = fetch_segments_by_ids(chunk_segment_ids) if chunk_segment_ids else []
+        per_query = similarity_search_chunks_multi(
+            embed_queries(queries),
+            top_k=top_k,
+            episode_id=state.get("episode_id"),
+            model_name=settings.embedding_model,
+            dims=settings.embedding_dims,
+        )
+        chunk_ids = _rank_chunk_ids(per_query)
+        segment_ids_by_chunk = fetch_segment_ids_for_chunks(chunk_ids)
+        chunk_segment_ids = list(
+            dict.fromkeys(seg_id for chunk_id in chunk_ids for seg_id in segment_ids_by_chunk.get(chunk_id, []))
+        )
+        segments_by_id = {seg.id: seg for seg in fetch_segments_by_ids(chunk_segment_ids)}
+        hits = [segments_by_id[seg_id] for seg_id in chunk_segment_ids if seg_id in segments_by_id]
     except Exception:
         hits = []
     if not hits:
-        for seg in segments:
-            if question.lower() in seg.text.lower():
-                hits.append(seg)
+        segments = state.get("segments") or fetch_episode_segments(state["episode_id"])
+        texts = _state_columns(state, segments).texts
+        needles = [question, *(q for q in (optimized.queries if optimized else []) if q)]
+        pattern = re.compile("|".join(map(re.escape, dict.fromkeys(needles))), re.IGNORECASE)
+        hits = [segments[idx] for idx, text in enumerate(texts) if pattern.search(text)]
         if not hits:
             hits = segments[:3]
     citations = [
@@ -236,8 +351,8 @@ def qa_chain(state: GraphState) -> GraphState:
         f"{c['speaker']} @ {c['timestamp']}s: {c['quote']}" for c in citations if c["quote"]
     ]
     answer_text = "\n".join([c["quote"] for c in citations])
+    answered = False
     try:
-        from .llm import get_chat_model
         from langchain_core.messages import HumanMessage, SystemMessage
 
         if context_lines:
@@ -247,15 +362,44 @@ def qa_chain(state: GraphState) -> GraphState:
                 "If the answer is not in the snippets, say you don't know."
             )
             user = f"Question: {question}\n\nSnippets:\n" + "\n".join(context_lines)
-            message = model.invoke([SystemMessage(content=system), HumanMessage(content=user)])
-            answer_text = message.content.strip() or answer_text
+            key = llm_cache.response_key("qa", system, user, "", settings.model, settings.temperature)
+            content = llm_cache.get(key) if use_cache else None
+            if content is None:
+                message = model.invoke([SystemMessage(content=system), HumanMessage(content=user)])
+                content = message.content.strip()
+                if use_cache:
+                    llm_cache.put(key, content)
+            answer_text = content or answer_text
+            answered = True
     except Exception:
         pass
     if answer_text.strip().lower() in {"i don't know", "i don't know.", "i do not know"}:
         answer_text = "Based on retrieved snippets:\n" + "\n".join([c["quote"] for c in citations])
     if mode == "verify" and any(token in question.lower() for token in ["benchmark", "cost", "numbers"]):
         answer_text += "\n\nNote: verification mode is not yet implemented in this phase."
-    return {**state, "answer": {"answer": answer_text, "citations": citations}}
+    answer = {"answer": answer_text, "citations": citations}
+    if answered and question_vec is not None:
+        llm_cache.store_answer(question_vec, settings.embedding_model, answer_scope, answer)
+    return {**state, "answer": answer}
+
+
+def _compact_json(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _rank_chunk_ids(per_query: list[list[tuple]]) -> list[int]:
+    """Order chunk ids by their best 1 / (1 + distance) across queries; ties keep first-seen order."""
+    hits = [hit for chunk_results in per_query for hit in chunk_results]
+    if not hits:
+        return []
+    ids = np.fromiter((chunk.id for chunk, _distance in hits), dtype=np.int64, count=len(hits))
+    distances = np.fromiter((distance for _chunk, distance in hits), dtype=np.float64, count=len(hits))
+    scores = 1.0 / (1.0 + distances)
+    unique_ids, first_seen, inverse = np.unique(ids, return_index=True, return_inverse=True)
+    best = np.full(len(unique_ids), -np.inf)
+    np.maximum.at(best, inverse, scores)
+    order = np.lexsort((first_seen, -best))
+    return unique_ids[order].tolist()
 
 
 def should_refine(state: GraphState) -> str:
@@ -265,9 +409,6 @@ def should_refine(state: GraphState) -> str:
 
 
 def optimize_query_node(state: GraphState) -> GraphState:
-    from .llm import load_prompt
-    from pathlib import Path
-
     prompt_path = Path(__file__).resolve().parent / "prompts" / "query_optimizer.txt"
     system = load_prompt(str(prompt_path))
     user = {
@@ -277,6 +418,6 @@ def optimize_query_node(state: GraphState) -> GraphState:
         },
     }
     result: QueryOptimizationResult = call_json(
-        "query_optimizer", system, json.dumps(user, ensure_ascii=False), QueryOptimizationResult, user
+        "query_optimizer", system, _compact_json(user), QueryOptimizationResult, user
     )
     return {**state, "optimized": result}
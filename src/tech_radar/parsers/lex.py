@@ -1,83 +1,105 @@
 from __future__ import annotations
 
+import codecs
 import re
 
-import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 
+from ..config import get_settings
 from ..schemas import EpisodeInput, Segment, TranscriptParseResult
-from ..utils import build_youtube_url, hash_text, to_seconds
+from ..utils import hash_text, youtube_url_prefix
 from .generic import GenericHtmlTextExtractor
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except Exception:  # pragma: no cover - selectolax is an optional speedup
+    HTMLParser = None
+
+
+# One pass over the page text: each match is a stripped, non-empty line, either a
+# "(hh:mm:ss) text" / "(hh:mm:ss)" timestamp line or a plain line.
+_LINE_RE = re.compile(
+    r"(?m)^[^\S\n]*(?:"
+    r"\((?P<time>(?P<h>\d{1,2}):(?P<m>\d{2}):(?P<s>\d{2}))\)[^\S\n]*(?P<text>[^\n]*\S)?"
+    r"|(?P<line>[^\n]*\S)"
+    r")[^\S\n]*$"
+)
+_PUNCT_RE = re.compile(r"[.?!—–]")
+_SECTION_HEADINGS = frozenset({"introduction", "sponsors", "transcript"})
+# BeautifulSoup's get_text leaves these out of the page text.
+_SKIP_TEXT_TAGS = frozenset({"script", "style", "template"})
+_ENTRY_TITLE_XPATH = (
+    "//article//h1[contains(concat(' ', normalize-space(@class), ' '), ' entry-title ')]"
+)
+_TOC_XPATH = "//a[contains(@href, 't=') or contains(@href, 'start=')]"
+_YOUTUBE_XPATH = "//a[contains(@href, 'youtube.com/watch') or contains(@href, 'youtu.be')]"
 
-class LexTranscriptParser:
-    time_only_re = re.compile(r"^\((?P<time>\d{1,2}:\d{2}:\d{2})\)\s*$")
-    time_inline_re = re.compile(r"^\((?P<time>\d{1,2}:\d{2}:\d{2})\)\s*(?P<text>.+)$")
 
+class LexTranscriptParser:
     def fetch_html(self, url: str) -> str:
+        import requests
+
         response = requests.get(url, timeout=30)
         response.raise_for_status()
         return response.text
 
-    def parse(self, url: str) -> TranscriptParseResult:
-        html = self.fetch_html(url)
-        soup = BeautifulSoup(html, "lxml")
-        title_tag = (
-            soup.select_one("article h1.entry-title")
-            or soup.select_one("article h1")
-            or soup.select_one("main h1")
-        )
-
-        title = title_tag.get_text(" ", strip=True) if title_tag else None
+    def stream_html(self, url: str) -> tuple[str, etree._Element | None]:
+        """Download the page while lxml builds its tree, returning the text and the root."""
+        import requests
 
-        toc = []
-        for anchor in soup.select("a[href*='t='], a[href*='start=']"):
-            label = anchor.get_text(strip=True)
-            href = anchor.get("href")
-            if label and href:
-                toc.append({"label": label, "href": href})
+        parser = etree.HTMLPullParser()
+        parts: list[str] = []
+        with requests.get(url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            for chunk in response.iter_content(65536):
+                part = decoder.decode(chunk)
+                if part:
+                    parts.append(part)
+                    parser.feed(part)
+            part = decoder.decode(b"", final=True)
+            if part:
+                parts.append(part)
+                parser.feed(part)
+        try:
+            root = parser.close()
+        except etree.XMLSyntaxError:
+            root = None
+        return "".join(parts), root
 
-        youtube_base = None
-        for anchor in soup.select("a[href*='youtube.com/watch'], a[href*='youtu.be']"):
-            youtube_base = anchor.get("href")
-            if youtube_base:
-                break
+    def parse(self, url: str) -> TranscriptParseResult:
+        html_parser = get_settings().html_parser
+        if html_parser in {"auto", "lxml"}:
+            html, root = self.stream_html(url)
+            title, toc, youtube_base, full_text = self._read_page_lxml(root)
+        else:
+            html = self.fetch_html(url)
+            if html_parser == "selectolax" and HTMLParser is not None:
+                title, toc, youtube_base, full_text = self._read_page_selectolax(html)
+            else:
+                title, toc, youtube_base, full_text = self._read_page_bs4(html)
 
         segments: list[Segment] = []
         current_speaker: str | None = None
 
-        lines = [line.strip() for line in soup.get_text("\n").splitlines() if line.strip()]
-
-        def looks_like_speaker(line: str) -> bool:
-            # exclude title
-            if line.startswith("(") and ")" in line:
-                return False
-            if len(line) > 80:
-                return False
-            if line.lower() in {"introduction", "sponsors", "transcript"}:
-                return False
-            # shouldn't include many punctuations
-            if any(ch in line for ch in [".", "?", "!", "—", "–"]):
-                return False
-            return True
-
         pending_time: str | None = None
+        pending_start = 0
+        youtube_prefix = youtube_url_prefix(youtube_base)
 
-        for line in lines:
+        for m in _LINE_RE.finditer(full_text):
+            time_str = m.group("time")
+            text = m.group("text")
             # 1) inline: (00:00:00) text...
-            m = self.time_inline_re.match(line)
-            if m:
+            if time_str and text:
                 if not current_speaker:
                     # If not speaker, just skip
                     continue
-                time_str = m.group("time")
-                text = m.group("text").strip()
-                t_start = to_seconds(time_str)
+                t_start = int(m.group("h")) * 3600 + int(m.group("m")) * 60 + int(m.group("s"))
                 segments.append(
-                    Segment(
+                    Segment.model_construct(
                         speaker=current_speaker,
                         t_start_sec=t_start,
-                        youtube_url=build_youtube_url(youtube_base, t_start) if youtube_base else None,
+                        youtube_url=f"{youtube_prefix}{t_start}s" if youtube_prefix else None,
                         text=text,
                         hash=hash_text(f"{current_speaker}|{time_str}|{text}"),
                     )
@@ -86,15 +108,17 @@ class LexTranscriptParser:
                 continue
 
             # 2) time only: (00:00:00)
-            m = self.time_only_re.match(line)
-            if m:
-                pending_time = m.group("time")
+            if time_str:
+                pending_time = time_str
+                pending_start = int(m.group("h")) * 3600 + int(m.group("m")) * 60 + int(m.group("s"))
                 continue
 
+            line = m.group("line")
+
             # 3) if we have a pending time, this line is very likely the text
             if pending_time:
                 # If this is speaker line, update speaker and continue
-                if looks_like_speaker(line):
+                if _looks_like_speaker(line):
                     current_speaker = line
                     continue
 
@@ -104,13 +128,13 @@ class LexTranscriptParser:
                     continue
 
                 time_str = pending_time
-                text = line.strip()
-                t_start = to_seconds(time_str)
+                text = line
+                t_start = pending_start
                 segments.append(
-                    Segment(
+                    Segment.model_construct(
                         speaker=current_speaker,
                         t_start_sec=t_start,
-                        youtube_url=build_youtube_url(youtube_base, t_start) if youtube_base else None,
+                        youtube_url=f"{youtube_prefix}{t_start}s" if youtube_prefix else None,
                         text=text,
                         hash=hash_text(f"{current_speaker}|{time_str}|{text}"),
                     )
@@ -119,20 +143,138 @@ class LexTranscriptParser:
                 continue
 
             # 4) otherwise: maybe a speaker line
-            if looks_like_speaker(line):
+            if _looks_like_speaker(line):
                 current_speaker = line
 
 
         # If # of segments are too small, the parsing may have problems
         if len(segments) < 30:
+            lines = [line.strip() for line in full_text.splitlines() if line.strip()]
             sample = "\n".join(lines[:60])
             raise ValueError(f"Lex parse suspicious: only {len(segments)} segments.\nSample:\n{sample}")
 
         if not segments:
             return GenericHtmlTextExtractor().parse(html, source_url=url)
 
-        return TranscriptParseResult(
-            episode=EpisodeInput(source_url=url, title=title, raw_html=html),
+        # Every field was built by this parser from typed values; skip re-validating the segment list.
+        return TranscriptParseResult.model_construct(
+            episode=EpisodeInput.model_construct(source_url=url, title=title, raw_html=html),
             toc=toc,
             segments=segments,
         )
+
+    def _read_page_bs4(self, html: str) -> tuple[str | None, list[dict], str | None, str]:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "lxml")
+        title_tag = (
+            soup.select_one("article h1.entry-title")
+            or soup.select_one("article h1")
+            or soup.select_one("main h1")
+        )
+
+        title = title_tag.get_text(" ", strip=True) if title_tag else None
+
+        toc = []
+        for anchor in soup.select("a[href*='t='], a[href*='start=']"):
+            label = anchor.get_text(strip=True)
+            href = anchor.get("href")
+            if label and href:
+                toc.append({"label": label, "href": href})
+
+        youtube_base = None
+        for anchor in soup.select("a[href*='youtube.com/watch'], a[href*='youtu.be']"):
+            youtube_base = anchor.get("href")
+            if youtube_base:
+                break
+
+        return title, toc, youtube_base, soup.get_text("\n")
+
+    def _read_page_lxml(
+        self, root: etree._Element | None
+    ) -> tuple[str | None, list[dict], str | None, str]:
+        if root is None:
+            return None, [], None, ""
+        title_tags = (
+            root.xpath(_ENTRY_TITLE_XPATH)
+            or root.xpath("//article//h1")
+            or root.xpath("//main//h1")
+        )
+        title = " ".join(_stripped_strings(title_tags[0])) if title_tags else None
+
+        toc = []
+        for anchor in root.xpath(_TOC_XPATH):
+            label = "".join(_stripped_strings(anchor))
+            href = anchor.get("href")
+            if label and href:
+                toc.append({"label": label, "href": href})
+
+        youtube_base = None
+        for anchor in root.xpath(_YOUTUBE_XPATH):
+            youtube_base = anchor.get("href")
+            if youtube_base:
+                break
+
+        return title, toc, youtube_base, "\n".join(_iter_strings(root))
+
+    def _read_page_selectolax(self, html: str) -> tuple[str | None, list[dict], str | None, str]:
+        tree = HTMLParser(html)
+        title_tag = (
+            tree.css_first("article h1.entry-title")
+            or tree.css_first("article h1")
+            or tree.css_first("main h1")
+        )
+
+        title = _stripped_text(title_tag, " ") if title_tag else None
+
+        toc = []
+        for anchor in tree.css("a[href*='t='], a[href*='start=']"):
+            label = _stripped_text(anchor)
+            href = anchor.attributes.get("href")
+            if label and href:
+                toc.append({"label": label, "href": href})
+
+        youtube_base = None
+        for anchor in tree.css("a[href*='youtube.com/watch'], a[href*='youtu.be']"):
+            youtube_base = anchor.attributes.get("href")
+            if youtube_base:
+                break
+
+        # BeautifulSoup's get_text skips script/style/template contents; match that.
+        tree.strip_tags(["script", "style", "template"])
+        return title, toc, youtube_base, tree.root.text(separator="\n") if tree.root else ""
+
+
+def _stripped_text(node, separator: str = "") -> str:
+    # Same as BeautifulSoup's get_text(separator, strip=True): whitespace-only strings are dropped.
+    parts = (child.text_content.strip() for child in node.traverse(include_text=True) if child.tag == "-text")
+    return separator.join(part for part in parts if part)
+
+
+def _looks_like_speaker(line: str) -> bool:
+    # too long for a name
+    if len(line) > 80:
+        return False
+    # exclude title
+    if line.startswith("(") and ")" in line:
+        return False
+    if line.lower() in _SECTION_HEADINGS:
+        return False
+    # shouldn't include many punctuations
+    return _PUNCT_RE.search(line) is None
+
+
+def _iter_strings(element: etree._Element):
+    # Text and tails in document order, skipping comments and script/style/template contents.
+    if not isinstance(element.tag, str) or element.tag in _SKIP_TEXT_TAGS:
+        return
+    if element.text:
+        yield element.text
+    for child in element:
+        yield from _iter_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _stripped_strings(element: etree._Element) -> list[str]:
+    return [text.strip() for text in _iter_strings(element) if text.strip()]
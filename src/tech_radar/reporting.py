@@ -1,132 +1,130 @@
 from __future__ import annotations
 
+import io
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator, TextIO
+
+from sqlalchemy.orm import Session
 
 from .models import Assertion, Chunk, Episode, Segment, Topic
-from .storage import fetch_cards, fetch_chunks_for_episode
+from .storage import fetch_cards, fetch_top_chunks_with_segments, session_scope
 from .utils import first_sentence, take_quote
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+_EPISODE_FIELDS = ("id", "source_url", "title", "guests")
+_SEGMENT_FIELDS = ("id", "speaker", "t_start_sec", "youtube_url", "text")
+_TOPIC_FIELDS = ("id", "name", "summary", "start_seg_id", "end_seg_id")
+_ASSERTION_FIELDS = ("id", "assertion_type", "statement", "speaker", "segment_ids", "evidence_quote")
+_CARD_FIELDS = ("entity_id", "short_definition", "key_points", "comparisons", "recent_summary")
+
 
 def build_json_payload(
     episode: Episode,
     segments: list[Segment],
     topics: list[Topic],
     assertions: list[Assertion],
+    *,
+    session: Session | None = None,
 ) -> dict:
     return {
-        "episode": {
-            "id": episode.id,
-            "source_url": episode.source_url,
-            "title": episode.title,
-            "guests": episode.guests,
-        },
-        "segments": [
-            {
-                "id": seg.id,
-                "speaker": seg.speaker,
-                "t_start_sec": seg.t_start_sec,
-                "youtube_url": seg.youtube_url,
-                "text": seg.text,
-            }
-            for seg in segments
-        ],
-        "topics": [
-            {
-                "id": topic.id,
-                "name": topic.name,
-                "summary": topic.summary,
-                "start_seg_id": topic.start_seg_id,
-                "end_seg_id": topic.end_seg_id,
-            }
-            for topic in topics
-        ],
-        "assertions": [
-            {
-                "id": assertion.id,
-                "assertion_type": assertion.assertion_type,
-                "statement": assertion.statement,
-                "speaker": assertion.speaker,
-                "segment_ids": assertion.segment_ids,
-                "evidence_quote": assertion.evidence_quote,
-            }
-            for assertion in assertions
-        ],
-        "cards": [
-            {
-                "entity_id": card.entity_id,
-                "short_definition": card.short_definition,
-                "key_points": card.key_points,
-                "comparisons": card.comparisons,
-                "recent_summary": card.recent_summary,
-            }
-            for card in fetch_cards()
-        ],
+        "episode": _fields(episode, _EPISODE_FIELDS),
+        "segments": [_fields(seg, _SEGMENT_FIELDS) for seg in segments],
+        "topics": [_fields(topic, _TOPIC_FIELDS) for topic in topics],
+        "assertions": [_fields(assertion, _ASSERTION_FIELDS) for assertion in assertions],
+        "cards": [_fields(card, _CARD_FIELDS) for card in fetch_cards(session=session)],
     }
 
 
+def _fields(obj, names: tuple[str, ...]) -> dict:
+    return {name: getattr(obj, name) for name in names}
+
+
 def render_markdown(
     episode: Episode,
     segments: list[Segment],
     topics: list[Topic],
     assertions: list[Assertion],
+    *,
+    session: Session | None = None,
 ) -> str:
-    lines = [f"# Episode {episode.id}: {episode.title or 'Untitled'}", ""]
+    top_chunks = fetch_top_chunks_with_segments(
+        episode.id, chunk_limit=5, seg_per_chunk=3, session=session
+    )
+    buffer = io.StringIO()
+    _render_markdown_to(buffer, episode, segments, topics, assertions, top_chunks)
+    return buffer.getvalue()
+
+
+def _render_markdown_to(
+    out: TextIO,
+    episode: Episode,
+    segments: list[Segment],
+    topics: list[Topic],
+    assertions: list[Assertion],
+    top_chunks: list[tuple[Chunk, list[Segment]]],
+) -> None:
+    """Write the report line by line to out; no storage reads happen here."""
+    lines = _markdown_lines(episode, segments, topics, assertions, top_chunks)
+    out.write(next(lines))
+    for line in lines:
+        out.write("\n")
+        out.write(line)
+
+
+def _markdown_lines(
+    episode: Episode,
+    segments: list[Segment],
+    topics: list[Topic],
+    assertions: list[Assertion],
+    top_chunks: list[tuple[Chunk, list[Segment]]],
+) -> Iterator[str]:
+    if top_chunks:
+        key_segments = [seg for _chunk, segs in top_chunks for seg in segs][:10]
+    else:
+        key_segments = segments[:10]
+
+    yield f"# Episode {episode.id}: {episode.title or 'Untitled'}"
+    yield ""
     if episode.source_url:
-        lines.append(f"Source: {episode.source_url}")
-        lines.append("")
+        yield f"Source: {episode.source_url}"
+        yield ""
 
-    lines.append("## Topics")
+    yield "## Topics"
     for topic in topics:
-        lines.append(f"- **{topic.name}**: {topic.summary}")
+        yield f"- **{topic.name}**: {topic.summary}"
     if not topics:
-        lines.append("- (No topics extracted)")
+        yield "- (No topics extracted)"
 
-    lines.append("")
-    lines.append("## Assertions")
+    yield ""
+    yield "## Assertions"
     for assertion in assertions:
-        lines.append(f"- ({assertion.assertion_type}) {assertion.statement}")
-        lines.append(f"  - Evidence: \"{assertion.evidence_quote}\"")
-        lines.append(f"  - Segments: {assertion.segment_ids}")
+        yield f"- ({assertion.assertion_type}) {assertion.statement}"
+        yield f"  - Evidence: \"{assertion.evidence_quote}\""
+        yield f"  - Segments: {assertion.segment_ids}"
     if not assertions:
-        lines.append("- (No assertions extracted)")
-
-    lines.append("")
-    lines.append("## Key Segments")
-    chunks = fetch_chunks_for_episode(episode.id)
-    if chunks:
-        chunks_sorted = sorted(chunks, key=lambda c: c.t_start_sec or 0)[:5]
-        shown = 0
-        for chunk in chunks_sorted:
-            from .storage import fetch_segment_ids_for_chunk, fetch_segments_by_ids
-
-            seg_ids = fetch_segment_ids_for_chunk(chunk.id)
-            segs = fetch_segments_by_ids(seg_ids)[:3]
-            for seg in segs:
-                link = f" ({seg.youtube_url})" if seg.youtube_url else ""
-                lines.append(f"- {seg.speaker or 'Unknown'} @ {seg.t_start_sec}s{link}")
-                lines.append(f"  - {first_sentence(seg.text, 360)}")
-                shown += 1
-                if shown >= 10:
-                    break
-            if shown >= 10:
-                break
-    else:
-        for seg in segments[:10]:
-            link = f" ({seg.youtube_url})" if seg.youtube_url else ""
-            lines.append(f"- {seg.speaker or 'Unknown'} @ {seg.t_start_sec}s{link}")
-            lines.append(f"  - {first_sentence(seg.text, 360)}")
+        yield "- (No assertions extracted)"
 
-    lines.append("")
-    lines.append("## Chunks (Top)")
-    chunks = fetch_chunks_for_episode(episode.id)
-    for chunk in chunks[:5]:
-        lines.append(f"- Topic {chunk.topic_id} @ {chunk.t_start_sec}s–{chunk.t_end_sec}s:")
-        lines.append(f"  - {chunk.chunk_text}")
-    if not chunks:
-        lines.append("- (No chunks yet)")
+    yield ""
+    yield "## Key Segments"
+    for seg in key_segments:
+        link = f" ({seg.youtube_url})" if seg.youtube_url else ""
+        yield f"- {seg.speaker or 'Unknown'} @ {seg.t_start_sec}s{link}"
+        yield f"  - {first_sentence(seg.text, 360)}"
 
-    return "\n".join(lines)
+    yield ""
+    yield "## Chunks (Top)"
+    for chunk, _segs in top_chunks:
+        yield f"- Topic {chunk.topic_id} @ {chunk.t_start_sec}s–{chunk.t_end_sec}s:"
+        yield f"  - {chunk.chunk_text}"
+    if not top_chunks:
+        yield "- (No chunks yet)"
 
 
 def write_report(
@@ -136,12 +134,51 @@ def write_report(
     assertions: list[Assertion],
     out_path: str,
     json_out: str | None = None,
+    *,
+    session: Session | None = None,
+) -> None:
+    # One session for every storage read the report makes, unless the caller already holds one.
+    with session_scope(session) as session:
+        top_chunks = fetch_top_chunks_with_segments(
+            episode.id, chunk_limit=5, seg_per_chunk=3, session=session
+        )
+        payload = (
+            build_json_payload(episode, segments, topics, assertions, session=session)
+            if json_out
+            else None
+        )
+    if not json_out:
+        _write_markdown(out_path, episode, segments, topics, assertions, top_chunks)
+        return
+    # Everything is prefetched above; the two files share no state,
+    # so encode and write them side by side.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        markdown_done = pool.submit(
+            _write_markdown, out_path, episode, segments, topics, assertions, top_chunks
+        )
+        json_done = pool.submit(_write_json, json_out, payload)
+        markdown_done.result()
+        json_done.result()
+
+
+def _write_markdown(
+    out_path: str,
+    episode: Episode,
+    segments: list[Segment],
+    topics: list[Topic],
+    assertions: list[Assertion],
+    top_chunks: list[tuple[Chunk, list[Segment]]],
 ) -> None:
-    markdown = render_markdown(episode, segments, topics, assertions)
     Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-    Path(out_path).write_text(markdown, encoding="utf-8")
+    # Stream straight into the file instead of materializing the whole markdown string first.
+    with Path(out_path).open("w", encoding="utf-8", buffering=1 << 20) as handle:
+        _render_markdown_to(handle, episode, segments, topics, assertions, top_chunks)
 
-    if json_out:
-        payload = build_json_payload(episode, segments, topics, assertions)
-        Path(json_out).parent.mkdir(parents=True, exist_ok=True)
+
+def _write_json(json_out: str, payload: dict) -> None:
+    Path(json_out).parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        Path(json_out).write_bytes(orjson.dumps(payload, option=options))
+    else:
         Path(json_out).write_text(json.dumps(payload, indent=2), encoding="utf-8")
@@ -96,6 +96,12 @@ class AssertionResult(BaseModel):
     assertions: list[Assertion]
 
 
+class EpisodeAnalysisResult(BaseModel):
+    topics: list[Topic]
+    entities: list[Entity]
+    assertions: list[Assertion]
+
+
 class CardResult(BaseModel):
     cards: list[TechCard]
     needs_refine: bool = False
@@ -3,12 +3,14 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+from .config import reset_settings
 from .graph import build_ingest_graph, build_qa_graph
 from .migrations import run_init
 
 
 def main() -> None:
     os.environ["TECH_RADAR_STUB_LLM"] = "true"
+    reset_settings()
     run_init()
 
     sample = Path(__file__).resolve().parents[2] / "examples" / "sample_transcript.txt"
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from .config import get_settings
+
+
+class SqliteCache:
+    """One SQLite file under CACHE_DIR, opened on first use; disabled when CACHE_DIR is empty."""
+
+    def __init__(self, filename: str, *ddl: str) -> None:
+        self.filename = filename
+        self.ddl = ddl
+        self.lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def connection(self) -> sqlite3.Connection | None:
+        """Return the shared connection; callers hold self.lock around its use."""
+        if self._conn is None:
+            cache_dir = get_settings().cache_dir
+            if not cache_dir:
+                return None
+            path = Path(cache_dir).expanduser()
+            path.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(path / self.filename, check_same_thread=False)
+            for statement in self.ddl:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def reset(self) -> None:
+        self._conn = None
+
+
+def unit_vector(vec: Iterable[float]) -> np.ndarray:
+    arr = np.asarray(vec, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    return arr / norm if norm else arr
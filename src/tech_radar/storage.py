@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from typing import Iterable
-
-from sqlalchemy import select, text
-from pgvector.psycopg import Vector as PgVector
-
+import threading
+import time
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator
+
+from sqlalchemy import Row, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .config import get_settings
 from .db import get_session
-from .models import Assertion, Chunk, ChunkSegment, Embedding, Entity, Episode, Segment, TechCard, Topic
+from .models import Assertion, Chunk, ChunkSegment, Embedding, Entity, Episode, ExtractionCache, Segment, TechCard, Topic
 from .schemas import Assertion as AssertionSchema
 from .schemas import Entity as EntitySchema
 from .schemas import Chunk as ChunkSchema
@@ -14,6 +21,29 @@ from .schemas import EpisodeInput, Segment as SegmentSchema, TechCard as TechCar
 from .schemas import Topic as TopicSchema
 from .utils import hash_text, normalize_name
 
+_INSERT_PAGE = 1000
+# fetch_cards scans the whole table; reports and exports reuse one read for a short while.
+# upsert_cards invalidates it in this process, the TTL bounds staleness from other processes.
+# Rows are plain column tuples, so nothing cached is tied to the session that read it.
+_CARDS_TTL_SEC = 60.0
+_cards_lock = threading.Lock()
+_cards_cache: tuple[float, list[Row]] | None = None
+# Bumped on every invalidation; a read that started before one must not repopulate the cache.
+_cards_generation = 0
+
+
+@contextmanager
+def session_scope(existing: Session | None = None) -> Iterator[Session]:
+    """Reuse the caller's session (and transaction) when given one.
+
+    Otherwise open a new one and commit it on exit.
+    """
+    if existing is not None:
+        yield existing
+        return
+    with get_session() as session:
+        yield session
+
 
 def upsert_episode(episode: EpisodeInput) -> Episode:
     with get_session() as session:
@@ -44,92 +74,94 @@ def upsert_episode(episode: EpisodeInput) -> Episode:
     return created
 
 
-def fetch_episode(episode_id: int) -> Episode | None:
-    with get_session() as session:
+def fetch_episode(episode_id: int, *, session: Session | None = None) -> Episode | None:
+    with session_scope(session) as session:
         return session.execute(select(Episode).where(Episode.id == episode_id)).scalar_one_or_none()
 
 
 def upsert_segments(episode_id: int, segments: Iterable[SegmentSchema]) -> list[Segment]:
-    stored: list[Segment] = []
+    rows = [
+        {
+            "episode_id": episode_id,
+            "speaker": seg.speaker,
+            "t_start_sec": seg.t_start_sec,
+            "t_end_sec": seg.t_end_sec,
+            "youtube_url": seg.youtube_url,
+            "text": seg.text,
+            "hash": seg.hash or hash_text(seg.text),
+        }
+        for seg in segments
+    ]
+    if not rows:
+        return []
+    new_rows = _first_by_key(rows, "hash")
     with get_session() as session:
-        for seg in segments:
-            hash_value = seg.hash or hash_text(seg.text)
-            existing = session.execute(
-                select(Segment).where(Segment.hash == hash_value)
-            ).scalar_one_or_none()
-            if existing:
-                stored.append(existing)
-                continue
-            created = Segment(
-                episode_id=episode_id,
-                speaker=seg.speaker,
-                t_start_sec=seg.t_start_sec,
-                t_end_sec=seg.t_end_sec,
-                youtube_url=seg.youtube_url,
-                text=seg.text,
-                hash=hash_value,
-            )
-            session.add(created)
-            session.flush()
-            stored.append(created)
-    return stored
+        _insert_ignoring_conflicts(session, Segment, new_rows, "hash")
+        by_hash = _fetch_by_key(session, Segment, Segment.hash, [row["hash"] for row in new_rows])
+    return [by_hash[row["hash"]] for row in rows]
 
 
 def upsert_entities(episode_id: int, entities: Iterable[EntitySchema]) -> list[Entity]:
-    stored: list[Entity] = []
+    entities = list(entities)
+    if not entities:
+        return []
+    grouped: dict[str, list[EntitySchema]] = {}
+    for ent in entities:
+        grouped.setdefault(normalize_name(ent.canonical_name), []).append(ent)
     with get_session() as session:
-        for ent in entities:
-            canonical = normalize_name(ent.canonical_name)
-            existing = session.execute(
-                select(Entity).where(Entity.canonical_name == canonical)
-            ).scalar_one_or_none()
-            if existing:
-                existing.last_seen_episode_id = episode_id
-                existing.aliases = sorted(set(existing.aliases + ent.aliases))
-                stored.append(existing)
+        existing = _fetch_by_key(session, Entity, Entity.canonical_name, list(grouped))
+        new_rows = []
+        for canonical, group in grouped.items():
+            aliases = sorted(set(alias for ent in group for alias in ent.aliases))
+            if canonical in existing:
+                found = existing[canonical]
+                found.last_seen_episode_id = episode_id
+                found.aliases = sorted(set(found.aliases + aliases))
                 continue
-            created = Entity(
-                type=ent.type,
-                canonical_name=canonical,
-                aliases=ent.aliases,
-                first_seen_episode_id=episode_id,
-                last_seen_episode_id=episode_id,
+            new_rows.append(
+                {
+                    "type": group[0].type,
+                    "canonical_name": canonical,
+                    # A lone mention keeps its alias order;
+                    # repeats merge like an existing entity would.
+                    "aliases": group[0].aliases if len(group) == 1 else aliases,
+                    "first_seen_episode_id": episode_id,
+                    "last_seen_episode_id": episode_id,
+                }
             )
-            session.add(created)
-            session.flush()
-            stored.append(created)
-    return stored
+        _insert_ignoring_conflicts(session, Entity, new_rows, "canonical_name")
+        new_names = [row["canonical_name"] for row in new_rows]
+        existing.update(_fetch_by_key(session, Entity, Entity.canonical_name, new_names))
+    return [existing[normalize_name(ent.canonical_name)] for ent in entities]
 
 
 def upsert_assertions(assertions: Iterable[AssertionSchema]) -> list[Assertion]:
-    stored: list[Assertion] = []
-    with get_session() as session:
-        for assertion in assertions:
-            hash_value = hash_text(
+    rows = [
+        {
+            "episode_id": assertion.episode_id,
+            "entity_id": assertion.entity_id,
+            "assertion_type": assertion.assertion_type,
+            "statement": assertion.statement,
+            "speaker": assertion.speaker,
+            "confidence": assertion.confidence,
+            "verify_priority": assertion.verify_priority,
+            "segment_ids": assertion.segment_ids,
+            "evidence_quote": assertion.evidence_quote,
+            "hash": hash_text(
                 f"{assertion.episode_id}|{assertion.statement}|{assertion.speaker}|{assertion.segment_ids}"
-            )
-            existing = session.execute(
-                select(Assertion).where(Assertion.hash == hash_value)
-            ).scalar_one_or_none()
-            if existing:
-                stored.append(existing)
-                continue
-            created = Assertion(
-                episode_id=assertion.episode_id,
-                entity_id=assertion.entity_id,
-                assertion_type=assertion.assertion_type,
-                statement=assertion.statement,
-                speaker=assertion.speaker,
-                confidence=assertion.confidence,
-                verify_priority=assertion.verify_priority,
-                segment_ids=assertion.segment_ids,
-                evidence_quote=assertion.evidence_quote,
-                hash=hash_value,
-            )
-            session.add(created)
-            session.flush()
-            stored.append(created)
-    return stored
+            ),
+        }
+        for assertion in assertions
+    ]
+    if not rows:
+        return []
+    new_rows = _first_by_key(rows, "hash")
+    with get_session() as session:
+        _insert_ignoring_conflicts(session, Assertion, new_rows, "hash")
+        by_hash = _fetch_by_key(
+            session, Assertion, Assertion.hash, [row["hash"] for row in new_rows]
+        )
+    return [by_hash[row["hash"]] for row in rows]
 
 
 def upsert_cards(cards: Iterable[TechCardSchema]) -> list[TechCard]:
@@ -156,89 +188,191 @@ def upsert_cards(cards: Iterable[TechCardSchema]) -> list[TechCard]:
             session.add(created)
             session.flush()
             stored.append(created)
+    invalidate_cards_cache()
     return stored
 
 
 def upsert_chunks(episode_id: int, chunks: Iterable[ChunkSchema]) -> list[Chunk]:
-    stored: list[Chunk] = []
+    chunks = list(chunks)
+    rows = [
+        {
+            "episode_id": episode_id,
+            "topic_id": chunk.topic_id,
+            "start_seg_id": chunk.start_seg_id,
+            "end_seg_id": chunk.end_seg_id,
+            "t_start_sec": chunk.t_start_sec,
+            "t_end_sec": chunk.t_end_sec,
+            "chunk_text": chunk.chunk_text,
+            "chunk_hash": hash_text(chunk.chunk_text),
+        }
+        for chunk in chunks
+    ]
+    if not rows:
+        return []
+    segment_ids: dict[str, list[int]] = {}
+    for row, chunk in zip(rows, chunks):
+        segment_ids.setdefault(row["chunk_hash"], chunk.segment_ids)
+    new_rows = _first_by_key(rows, "chunk_hash")
     with get_session() as session:
-        for chunk in chunks:
-            hash_value = hash_text(chunk.chunk_text)
-            existing = session.execute(select(Chunk).where(Chunk.chunk_hash == hash_value)).scalar_one_or_none()
-            if existing:
-                stored.append(existing)
-                continue
-            created = Chunk(
-                episode_id=episode_id,
-                topic_id=chunk.topic_id,
-                start_seg_id=chunk.start_seg_id,
-                end_seg_id=chunk.end_seg_id,
-                t_start_sec=chunk.t_start_sec,
-                t_end_sec=chunk.t_end_sec,
-                chunk_text=chunk.chunk_text,
-                chunk_hash=hash_value,
-            )
-            session.add(created)
-            session.flush()
-            for ord_idx, seg_id in enumerate(chunk.segment_ids):
-                session.add(ChunkSegment(chunk_id=created.id, segment_id=seg_id, ord=ord_idx))
-            stored.append(created)
-    return stored
+        inserted = _insert_ignoring_conflicts(
+            session, Chunk, new_rows, "chunk_hash", Chunk.id, Chunk.chunk_hash
+        )
+        # Only freshly inserted chunks get their segment links;
+        # existing ones already have them.
+        links = [
+            {"chunk_id": chunk_id, "segment_id": seg_id, "ord": ord_idx}
+            for chunk_id, chunk_hash in inserted
+            for ord_idx, seg_id in enumerate(segment_ids[chunk_hash])
+        ]
+        for start in range(0, len(links), _INSERT_PAGE):
+            session.execute(pg_insert(ChunkSegment).values(links[start : start + _INSERT_PAGE]))
+        by_hash = _fetch_by_key(
+            session, Chunk, Chunk.chunk_hash, [row["chunk_hash"] for row in new_rows]
+        )
+    return [by_hash[row["chunk_hash"]] for row in rows]
 
 
-def fetch_chunks_for_episode(episode_id: int) -> list[Chunk]:
-    with get_session() as session:
+def _first_by_key(rows: list[dict], key: str) -> list[dict]:
+    # First occurrence wins for repeated keys, matching the old row-at-a-time behaviour.
+    unique: dict = {}
+    for row in rows:
+        unique.setdefault(row[key], row)
+    return list(unique.values())
+
+
+def _insert_ignoring_conflicts(session, model, rows: list[dict], key: str, *returning) -> list:
+    """INSERT ... ON CONFLICT (key) DO NOTHING in pages.
+
+    Returns the RETURNING rows of the new inserts.
+    """
+    inserted: list = []
+    for start in range(0, len(rows), _INSERT_PAGE):
+        page = rows[start : start + _INSERT_PAGE]
+        statement = pg_insert(model).values(page).on_conflict_do_nothing(index_elements=[key])
+        if returning:
+            inserted.extend(session.execute(statement.returning(*returning)).all())
+        else:
+            session.execute(statement)
+    return inserted
+
+
+def _fetch_by_key(session, model, column, keys: list) -> dict:
+    found: dict = {}
+    for start in range(0, len(keys), _INSERT_PAGE):
+        page = keys[start : start + _INSERT_PAGE]
+        rows = session.execute(select(model).where(column.in_(page))).scalars()
+        found.update((getattr(row, column.key), row) for row in rows)
+    return found
+
+
+def fetch_chunks_for_episode(episode_id: int, *, session: Session | None = None) -> list[Chunk]:
+    with session_scope(session) as session:
         return list(session.execute(select(Chunk).where(Chunk.episode_id == episode_id)).scalars().all())
 
 
-def fetch_segment_ids_for_chunk(chunk_id: int) -> list[int]:
+def fetch_top_chunks_with_segments(
+    episode_id: int, chunk_limit: int = 5, seg_per_chunk: int = 3, *, session: Session | None = None
+) -> list[tuple[Chunk, list[Segment]]]:
+    """Earliest chunks of an episode with their first segments (by ord), in one round trip."""
+    sql = text(
+        (
+            "SELECT c.*, s.id AS seg_id, s.episode_id AS seg_episode_id, "
+            "s.speaker AS seg_speaker, s.t_start_sec AS seg_t_start_sec, "
+            "s.t_end_sec AS seg_t_end_sec, s.youtube_url AS seg_youtube_url, s.text AS seg_text, "
+            "s.hash AS seg_hash "
+            "FROM ("
+            "SELECT * FROM chunks WHERE episode_id = :episode_id "
+            "ORDER BY t_start_sec NULLS FIRST, id LIMIT :chunk_limit"
+            ") AS c "
+            "LEFT JOIN LATERAL ("
+            "SELECT seg.*, cs.ord FROM chunk_segments cs "
+            "JOIN segments seg ON seg.id = cs.segment_id "
+            "WHERE cs.chunk_id = c.id ORDER BY cs.ord LIMIT :seg_per_chunk"
+            ") AS s ON true "
+            "ORDER BY c.t_start_sec NULLS FIRST, c.id, s.ord"
+        )
+    )
+    params = {"episode_id": episode_id, "chunk_limit": chunk_limit, "seg_per_chunk": seg_per_chunk}
+    results: list[tuple[Chunk, list[Segment]]] = []
+    with session_scope(session) as session:
+        for row in session.execute(sql, params).mappings():
+            if not results or results[-1][0].id != row["id"]:
+                results.append((_chunk_from_row(row), []))
+            if row["seg_id"] is not None:
+                results[-1][1].append(
+                    Segment(
+                        id=row["seg_id"],
+                        episode_id=row["seg_episode_id"],
+                        speaker=row["seg_speaker"],
+                        t_start_sec=row["seg_t_start_sec"],
+                        t_end_sec=row["seg_t_end_sec"],
+                        youtube_url=row["seg_youtube_url"],
+                        text=row["seg_text"],
+                        hash=row["seg_hash"],
+                    )
+                )
+    return results
+
+
+def fetch_segment_ids_for_chunks(chunk_ids: list[int]) -> dict[int, list[int]]:
+    if not chunk_ids:
+        return {}
     with get_session() as session:
         rows = session.execute(
-            select(ChunkSegment.segment_id).where(ChunkSegment.chunk_id == chunk_id).order_by(ChunkSegment.ord)
-        ).scalars()
-        return list(rows)
+            select(ChunkSegment.chunk_id, ChunkSegment.segment_id)
+            .where(ChunkSegment.chunk_id.in_(chunk_ids))
+            .order_by(ChunkSegment.chunk_id, ChunkSegment.ord)
+        ).all()
+    return {
+        chunk_id: [segment_id for _chunk_id, segment_id in group]
+        for chunk_id, group in groupby(rows, key=itemgetter(0))
+    }
 
 
-def fetch_embeddings(
+def fetch_objects_needing_embeddings(
     object_type: str, object_ids: list[int], model_name: str, dims: int
-) -> set[int]:
+) -> list[int]:
+    """The ids from object_ids with no stored embedding for this model, in input order."""
     if not object_ids:
-        return set()
+        return []
+    sql = text(
+        (
+            "SELECT o.id FROM unnest(CAST(:object_ids AS integer[])) WITH ORDINALITY AS o(id, idx) "
+            "WHERE NOT EXISTS ("
+            "SELECT 1 FROM embeddings e "
+            "WHERE e.object_type = :object_type AND e.object_id = o.id "
+            "AND e.model_name = :model_name AND e.dims = :dims"
+            ") "
+            "ORDER BY o.idx"
+        )
+    )
+    params = {"object_ids": object_ids, "object_type": object_type, "model_name": model_name, "dims": dims}
     with get_session() as session:
-        rows = session.execute(
-            select(Embedding.object_id).where(
-                Embedding.object_type == object_type,
-                Embedding.object_id.in_(object_ids),
-                Embedding.model_name == model_name,
-                Embedding.dims == dims,
-            )
-        ).scalars()
-        return set(rows)
+        return list(session.execute(sql, params).scalars())
 
 
 def upsert_embeddings(
     object_type: str, object_ids: list[int], embeddings: list[list[float]], model_name: str, dims: int
 ) -> None:
+    # Last vector wins for a repeated id; one statement cannot update the same row twice.
+    by_id = dict(zip(object_ids, embeddings))
+    rows = [
+        {
+            "object_type": object_type,
+            "object_id": object_id,
+            "model_name": model_name,
+            "dims": dims,
+            "embedding": vector,
+        }
+        for object_id, vector in by_id.items()
+    ]
     with get_session() as session:
-        for object_id, vector in zip(object_ids, embeddings):
-            existing = session.execute(
-                select(Embedding).where(
-                    Embedding.object_type == object_type,
-                    Embedding.object_id == object_id,
-                    Embedding.model_name == model_name,
-                    Embedding.dims == dims,
-                )
-            ).scalar_one_or_none()
-            if existing:
-                existing.embedding = vector
-                continue
-            session.add(
-                Embedding(
-                    object_type=object_type,
-                    object_id=object_id,
-                    model_name=model_name,
-                    dims=dims,
-                    embedding=vector,
+        for start in range(0, len(rows), _INSERT_PAGE):
+            statement = pg_insert(Embedding).values(rows[start : start + _INSERT_PAGE])
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["object_type", "object_id", "model_name", "dims"],
+                    set_={"embedding": statement.excluded.embedding},
                 )
             )
 
@@ -251,11 +385,79 @@ def similarity_search_chunks(
     model_name: str | None = None,
     dims: int | None = None,
 ) -> list[tuple[Chunk, float]]:
+    where, params = _chunk_search_filters(episode_id, topic_id, model_name, dims)
+    params["query"] = _vector_text(query_embedding)
+    params["top_k"] = top_k
+    sql = text(
+        (
+            "SELECT c.*, (e.embedding <=> CAST(:query AS vector)) AS distance "
+            "FROM chunks c "
+            "JOIN embeddings e ON e.object_type = 'chunk' AND e.object_id = c.id "
+            f"{where} "
+            "ORDER BY e.embedding <=> CAST(:query AS vector) "
+            "LIMIT :top_k"
+        )
+    )
+    with get_session() as session:
+        _set_ef_search(session, top_k)
+        rows = session.execute(sql, params).mappings().all()
+        return [(_chunk_from_row(row), float(row["distance"])) for row in rows]
+
+
+def similarity_search_chunks_multi(
+    query_embeddings: list[list[float]],
+    top_k: int = 5,
+    episode_id: int | None = None,
+    topic_id: int | None = None,
+    model_name: str | None = None,
+    dims: int | None = None,
+) -> list[list[tuple[Chunk, float]]]:
+    """Run one top-k search per query vector in a single round trip, results in query order."""
+    if not query_embeddings:
+        return []
+    where, params = _chunk_search_filters(episode_id, topic_id, model_name, dims)
+    params["queries"] = [_vector_text(vec) for vec in query_embeddings]
+    params["top_k"] = top_k
+    sql = text(
+        (
+            "SELECT q.idx, hit.* "
+            "FROM unnest(CAST(:queries AS text[])) WITH ORDINALITY AS q(vec, idx) "
+            "CROSS JOIN LATERAL ("
+            "SELECT c.*, (e.embedding <=> CAST(q.vec AS vector)) AS distance "
+            "FROM chunks c "
+            "JOIN embeddings e ON e.object_type = 'chunk' AND e.object_id = c.id "
+            f"{where} "
+            "ORDER BY e.embedding <=> CAST(q.vec AS vector) "
+            "LIMIT :top_k"
+            ") AS hit "
+            "ORDER BY q.idx, hit.distance"
+        )
+    )
+    results: list[list[tuple[Chunk, float]]] = [[] for _vec in query_embeddings]
+    with get_session() as session:
+        _set_ef_search(session, top_k)
+        for row in session.execute(sql, params).mappings():
+            results[row["idx"] - 1].append((_chunk_from_row(row), float(row["distance"])))
+    return results
+
+
+def _set_ef_search(session, top_k: int) -> None:
+    # HNSW only returns up to ef_search candidates, so widen it for large top_k. Scoped to this transaction.
+    ef_search = max(get_settings().hnsw_ef_search, top_k * 4)
+    session.execute(text("SELECT set_config('hnsw.ef_search', :ef_search, true)"), {"ef_search": str(ef_search)})
+
+
+def _vector_text(vec: list[float]) -> str:
+    from pgvector.psycopg import Vector as PgVector
+
+    return PgVector(vec).to_text()
+
+
+def _chunk_search_filters(
+    episode_id: int | None, topic_id: int | None, model_name: str | None, dims: int | None
+) -> tuple[str, dict]:
     filters = []
-    params = {
-        "query": PgVector(query_embedding).to_text(),
-        "top_k": top_k,
-    }
+    params: dict = {}
     if episode_id is not None:
         filters.append("c.episode_id = :episode_id")
         params["episode_id"] = episode_id
@@ -269,33 +471,21 @@ def similarity_search_chunks(
         filters.append("e.dims = :dims")
         params["dims"] = dims
     where = f"WHERE {' AND '.join(filters)}" if filters else ""
-    sql = text(
-        (
-            "SELECT c.*, (e.embedding <=> CAST(:query AS vector)) AS distance "
-            "FROM chunks c "
-            "JOIN embeddings e ON e.object_type = 'chunk' AND e.object_id = c.id "
-            f"{where} "
-            "ORDER BY e.embedding <=> CAST(:query AS vector) "
-            "LIMIT :top_k"
-        )
+    return where, params
+
+
+def _chunk_from_row(row) -> Chunk:
+    return Chunk(
+        id=row["id"],
+        episode_id=row["episode_id"],
+        topic_id=row["topic_id"],
+        start_seg_id=row["start_seg_id"],
+        end_seg_id=row["end_seg_id"],
+        t_start_sec=row["t_start_sec"],
+        t_end_sec=row["t_end_sec"],
+        chunk_text=row["chunk_text"],
+        chunk_hash=row["chunk_hash"],
     )
-    with get_session() as session:
-        rows = session.execute(sql, params).mappings().all()
-        results = []
-        for row in rows:
-            chunk = Chunk(
-                id=row["id"],
-                episode_id=row["episode_id"],
-                topic_id=row["topic_id"],
-                start_seg_id=row["start_seg_id"],
-                end_seg_id=row["end_seg_id"],
-                t_start_sec=row["t_start_sec"],
-                t_end_sec=row["t_end_sec"],
-                chunk_text=row["chunk_text"],
-                chunk_hash=row["chunk_hash"],
-            )
-            results.append((chunk, float(row["distance"])))
-        return results
 
 
 def upsert_topics(episode_id: int, topics: Iterable[TopicSchema]) -> list[Topic]:
@@ -327,9 +517,63 @@ def fetch_episode_segments(episode_id: int) -> list[Segment]:
         )
 
 
-def fetch_cards() -> list[TechCard]:
-    with get_session() as session:
-        return list(session.execute(select(TechCard)).scalars().all())
+# Read-only column rows for report rendering:
+# plain Row tuples with attribute access, no ORM instances.
+_SEGMENT_REPORT_COLUMNS = (
+    Segment.id,
+    Segment.speaker,
+    Segment.t_start_sec,
+    Segment.youtube_url,
+    Segment.text,
+)
+_TOPIC_REPORT_COLUMNS = (Topic.id, Topic.name, Topic.summary, Topic.start_seg_id, Topic.end_seg_id)
+_ASSERTION_REPORT_COLUMNS = (
+    Assertion.id,
+    Assertion.assertion_type,
+    Assertion.statement,
+    Assertion.speaker,
+    Assertion.segment_ids,
+    Assertion.evidence_quote,
+)
+
+
+def fetch_episode_segment_rows(episode_id: int, *, session: Session | None = None) -> list[Row]:
+    with session_scope(session) as session:
+        statement = select(*_SEGMENT_REPORT_COLUMNS).where(Segment.episode_id == episode_id)
+        return list(session.execute(statement))
+
+
+def fetch_topic_rows_for_episode(episode_id: int, *, session: Session | None = None) -> list[Row]:
+    with session_scope(session) as session:
+        statement = select(*_TOPIC_REPORT_COLUMNS).where(Topic.episode_id == episode_id)
+        return list(session.execute(statement))
+
+
+def fetch_assertion_rows_for_episode(episode_id: int, *, session: Session | None = None) -> list[Row]:
+    with session_scope(session) as session:
+        statement = select(*_ASSERTION_REPORT_COLUMNS).where(Assertion.episode_id == episode_id)
+        return list(session.execute(statement))
+
+
+def fetch_cards(*, session: Session | None = None) -> list[Row]:
+    global _cards_cache
+    with _cards_lock:
+        if _cards_cache is not None and time.monotonic() - _cards_cache[0] < _CARDS_TTL_SEC:
+            return list(_cards_cache[1])
+        generation = _cards_generation
+    with session_scope(session) as session:
+        cards = list(session.execute(select(*TechCard.__table__.columns)))
+    with _cards_lock:
+        if generation == _cards_generation:
+            _cards_cache = (time.monotonic(), cards)
+    return list(cards)
+
+
+def invalidate_cards_cache() -> None:
+    global _cards_cache, _cards_generation
+    with _cards_lock:
+        _cards_cache = None
+        _cards_generation += 1
 
 
 def fetch_entities() -> list[Entity]:
@@ -349,8 +593,36 @@ def fetch_assertions_for_entity(entity_id: int) -> list[Assertion]:
         return list(session.execute(select(Assertion).where(Assertion.entity_id == entity_id)).scalars().all())
 
 
+def fetch_assertions_for_entities(entity_ids: list[int]) -> dict[int, list[Assertion]]:
+    grouped: dict[int, list[Assertion]] = {entity_id: [] for entity_id in entity_ids}
+    if not entity_ids:
+        return grouped
+    with get_session() as session:
+        rows = session.execute(select(Assertion).where(Assertion.entity_id.in_(entity_ids))).scalars()
+        for assertion in rows:
+            grouped[assertion.entity_id].append(assertion)
+    return grouped
+
+
 def fetch_segments_by_ids(segment_ids: list[int]) -> list[Segment]:
     if not segment_ids:
         return []
     with get_session() as session:
         return list(session.execute(select(Segment).where(Segment.id.in_(segment_ids))).scalars().all())
+
+
+def fetch_extraction(rollup: str, task: str) -> dict | None:
+    with get_session() as session:
+        return session.execute(
+            select(ExtractionCache.payload).where(ExtractionCache.rollup == rollup, ExtractionCache.task == task)
+        ).scalar_one_or_none()
+
+
+def store_extraction(rollup: str, task: str, payload: dict) -> None:
+    statement = pg_insert(ExtractionCache).values(rollup=rollup, task=task, payload=payload)
+    with get_session() as session:
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["rollup", "task"], set_={"payload": statement.excluded.payload}
+            )
+        )
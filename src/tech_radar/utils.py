@@ -2,25 +2,53 @@ from __future__ import annotations
 
 import hashlib
 import re
+from functools import lru_cache
+from itertools import chain
 from typing import Iterable
 
+from .config import get_settings
+
+try:
+    import blake3
+except Exception:  # pragma: no cover - blake3 is an optional speedup
+    blake3 = None
+
+_WS_RE = re.compile(r"\s+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Query expansion synonyms, keyed by lowercase token.
+_SYN = {
+    "ai": ("artificial intelligence", "llm", "model"),
+    "agent": ("agents", "agentic", "autonomous agent", "autonomy", "tool use"),
+    "china": ("chinese", "prc", "china ai", "china labs"),
+    "gpu": ("gpus", "graphics processor", "hardware"),
+    "cost": ("inference cost", "price per token", "compute cost"),
+}
+_SYN_KEYS = frozenset(_SYN)
+
 
 def hash_text(value: str) -> str:
-    return hashlib.sha256(value.strip().encode("utf-8")).hexdigest()
+    return _hash_text(value, get_settings().hash_algorithm)
+
+
+# Keyed on the algorithm too, so switching HASH_ALGORITHM never serves a stale digest.
+@lru_cache(maxsize=8192)
+def _hash_text(value: str, algorithm: str) -> str:
+    data = value.strip().encode("utf-8")
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise RuntimeError("HASH_ALGORITHM=blake3 requires the blake3 package")
+        return blake3.blake3(data).hexdigest()
+    return hashlib.sha256(data).hexdigest()
 
 
 def normalize_name(value: str) -> str:
-    return re.sub(r"\s+", " ", value.strip()).lower()
+    return _WS_RE.sub(" ", value.strip()).lower()
 
 
 def to_seconds(hms: str) -> int:
-    parts = [int(p) for p in hms.split(":")]
-    if len(parts) == 3:
-        h, m, s = parts
-    elif len(parts) == 2:
-        h, m, s = 0, parts[0], parts[1]
-    else:
-        h, m, s = 0, 0, parts[0]
+    # Right-align "s", "m:s" or "h:m:s" into (h, m, s).
+    h, m, s = ([0, 0, 0] + [int(p) for p in hms.split(":")])[-3:]
     return h * 3600 + m * 60 + s
 
 
@@ -34,38 +62,33 @@ def seconds_to_hms(seconds: int | None) -> str:
 
 
 def build_youtube_url(base: str | None, seconds: int | None) -> str | None:
-    if not base or seconds is None:
+    prefix = youtube_url_prefix(base)
+    if not prefix or seconds is None:
+        return None
+    return f"{prefix}{seconds}s"
+
+
+def youtube_url_prefix(base: str | None) -> str | None:
+    """Everything in a timestamped link before the seconds, so a parse loop can build each with one f-string."""
+    if not base:
         return None
-    if "?" in base:
-        return f"{base}&t={seconds}s"
-    return f"{base}?t={seconds}s"
+    return f"{base}&t=" if "?" in base else f"{base}?t="
 
 
 def compact_spaces(value: str) -> str:
-    return re.sub(r"\s+", " ", value).strip()
+    return _WS_RE.sub(" ", value).strip()
 
 
 def slugify(value: str) -> str:
     normalized = normalize_name(value)
-    normalized = re.sub(r"[^a-z0-9]+", "-", normalized)
+    normalized = _NON_ALNUM_RE.sub("-", normalized)
     return normalized.strip("-") or "unknown-entity"
 
 
 def expand_query(question: str) -> str:
     base = compact_spaces(question.lower())
-    synonyms = {
-        "ai": ["artificial intelligence", "llm", "model"],
-        "agent": ["agents", "agentic", "autonomous agent", "autonomy", "tool use"],
-        "china": ["chinese", "prc", "china ai", "china labs"],
-        "gpu": ["gpus", "graphics processor", "hardware"],
-        "cost": ["inference cost", "price per token", "compute cost"],
-    }
-    tokens = re.findall(r"[a-z0-9]+", base)
-    expanded = [base]
-    for token in tokens:
-        if token in synonyms:
-            expanded.extend(synonyms[token])
-    return " | ".join(dict.fromkeys(expanded))
+    parts = chain([base], *(_SYN[token] for token in _TOKEN_RE.findall(base) if token in _SYN_KEYS))
+    return " | ".join(dict.fromkeys(parts))
 
 
 def take_quote(text: str, limit: int = 240) -> str:
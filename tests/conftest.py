@@ -0,0 +1,16 @@
+import pytest
+
+from tech_radar import embeddings_cache, llm_cache
+from tech_radar.config import reset_settings
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+    llm_cache._cache.reset()
+    embeddings_cache._cache.reset()
+    reset_settings()
+    yield tmp_path
+    llm_cache._cache.reset()
+    embeddings_cache._cache.reset()
+    reset_settings()
@@ -0,0 +1,44 @@
+from tech_radar.chunking import build_chunks_from_topics
+from tech_radar.schemas import Segment, Topic
+from tech_radar.utils import estimate_tokens
+
+
+def _segments(count: int, text: str = "hello world") -> list[Segment]:
+    return [
+        Segment(id=i, speaker="Lex", t_start_sec=i * 10, t_end_sec=i * 10 + 9, text=text)
+        for i in range(1, count + 1)
+    ]
+
+
+def test_topic_range_limits_chunks_to_topic_segments():
+    segments = _segments(10)
+    topic = Topic(id=7, name="GPUs", summary="", start_seg_id=3, end_seg_id=6)
+    chunks = build_chunks_from_topics([topic], segments)
+    assert chunks
+    assert all(chunk.topic_id == 7 for chunk in chunks)
+    seg_ids = {sid for chunk in chunks for sid in chunk.segment_ids}
+    assert seg_ids == {3, 4, 5, 6}
+
+
+def test_unknown_topic_bounds_fall_back_to_all_segments():
+    segments = _segments(4)
+    topic = Topic(id=1, name="Other", summary="", start_seg_id=99, end_seg_id=2)
+    chunks = build_chunks_from_topics([topic], segments)
+    assert chunks[0].start_seg_id == 1
+    assert chunks[-1].end_seg_id == 4
+
+
+def test_windows_shrink_to_fit_token_budget():
+    segments = _segments(6, text="x" * 400)
+    chunks = build_chunks_from_topics([], segments, max_tokens=250, min_segs=2, max_segs=6)
+    assert chunks
+    assert all(len(chunk.segment_ids) == 2 for chunk in chunks)
+    assert chunks[0].chunk_text.startswith("Lex (00:00:10)")
+
+
+def test_windows_respect_budget_on_the_joined_text():
+    # Per-segment rounding and the "\n" joiners must count against the budget.
+    for length in range(20, 60):
+        segments = _segments(6, text="y" * length)
+        for chunk in build_chunks_from_topics([], segments, max_tokens=40, min_segs=1, max_segs=6):
+            assert estimate_tokens(chunk.chunk_text) <= 40 or len(chunk.segment_ids) == 1
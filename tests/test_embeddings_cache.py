@@ -0,0 +1,18 @@
+from tech_radar import embeddings_cache
+from tech_radar.config import reset_settings
+
+
+def test_vectors_round_trip_per_model_and_dims(cache_dir):
+    embeddings_cache.store_vectors(["hello"], [[0.5, 0.25]], "model-a", 2)
+    assert embeddings_cache.load_vectors(["hello", "other"], "model-a", 2) == [[0.5, 0.25], None]
+    assert embeddings_cache.load_vectors(["hello"], "model-b", 2) == [None]
+    assert (cache_dir / "embeddings.sqlite3").exists()
+
+
+def test_empty_cache_dir_disables_cache(monkeypatch):
+    monkeypatch.setenv("CACHE_DIR", "")
+    embeddings_cache._cache.reset()
+    reset_settings()
+    embeddings_cache.store_vectors(["hello"], [[1.0]], "model-a", 1)
+    assert embeddings_cache.load_vectors(["hello"], "model-a", 1) == [None]
+    reset_settings()
@@ -0,0 +1,31 @@
+from tech_radar import nodes
+from tech_radar.config import reset_settings
+from tech_radar.schemas import EpisodeAnalysisResult, Segment
+
+
+def test_reingesting_unchanged_episode_replays_the_analysis(monkeypatch):
+    monkeypatch.setenv("TECH_RADAR_STUB_LLM", "false")
+    reset_settings()
+    stored: dict[tuple[str, str], dict] = {}
+    calls: list[str] = []
+
+    def fake_call_json(task, system, user, schema, context):
+        calls.append(task)
+        return EpisodeAnalysisResult(topics=[], entities=[], assertions=[])
+
+    monkeypatch.setattr(nodes, "call_json", fake_call_json)
+    monkeypatch.setattr(nodes, "fetch_extraction", lambda rollup, task: stored.get((rollup, task)))
+    def fake_store(rollup, task, payload):
+        stored[(rollup, task)] = payload
+
+    monkeypatch.setattr(nodes, "store_extraction", fake_store)
+    for name in ("upsert_topics", "upsert_entities"):
+        monkeypatch.setattr(nodes, name, lambda episode_id, items: list(items))
+    monkeypatch.setattr(nodes, "upsert_assertions", lambda items: list(items))
+
+    segments = [Segment(id=1, speaker="Lex", t_start_sec=0, text="GPUs are scarce.", hash="h1")]
+    state = {"episode_id": 1, "segments": segments}
+    nodes.episode_analyzer(state)
+    nodes.episode_analyzer(state)
+    assert calls == ["episode_analysis"]
+    reset_settings()
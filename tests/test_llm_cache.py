@@ -0,0 +1,17 @@
+from tech_radar import llm_cache
+
+
+def test_exact_responses_are_keyed_on_the_full_prompt(cache_dir):
+    key = llm_cache.response_key("topics", "sys", "user", "TopicResult", "gpt", 0.3)
+    assert key != llm_cache.response_key("topics", "sys", "user", "TopicResult", "gpt", 0.0)
+    assert llm_cache.get(key) is None
+    llm_cache.put(key, '{"topics": []}')
+    assert llm_cache.get(key) == '{"topics": []}'
+
+
+def test_answers_match_near_duplicate_questions_within_scope(cache_dir):
+    answer = {"answer": "Cheap.", "citations": []}
+    llm_cache.store_answer([1.0, 0.0], "model-a", "1", answer)
+    assert llm_cache.find_answer([0.99, 0.05], "model-a", "1", 0.92) == answer
+    assert llm_cache.find_answer([0.0, 1.0], "model-a", "1", 0.92) is None
+    assert llm_cache.find_answer([1.0, 0.0], "model-a", "2", 0.92) is None